@@ -6,8 +6,8 @@ from plotly.subplots import make_subplots
 import numpy as np
 from modules import financial_performance
 import os
+from concurrent.futures import ThreadPoolExecutor
 import streamlit_authenticator as stauth
-import yaml
 from modules import financial_performance
 from modules.operations_production import production_operations_page
 from modules import access
@@ -15,10 +15,10 @@ from modules import service_delivery
 from modules import overview #added from modules
 from modules import profile
 from modules.login import show_login_page
+from modules.config_store import load_config
 from components.container import card_container
 from streamlit_authenticator.utilities import LoginError
-from yaml.loader import SafeLoader
-from modules.chatbot import bot, DATASETS   
+from modules.chatbot import get_bot
 
 
 st.set_page_config(
@@ -51,8 +51,7 @@ load_css("styles/dashboard.css")
 #      config["cookie"]["key"],
 #      config["cookie"]["expiry_days"],)
 
-with open("config.yaml", "r") as file:
-    config = yaml.safe_load(file)
+config = load_config()
 
 # Defensive checks so we don't get a weird TypeError
 if not isinstance(config, dict):
@@ -78,6 +77,62 @@ if "authentication_status" not in st.session_state:
     st.session_state["name"] = None
     st.session_state["username"] = None
 
+# --- DATA LOADING ---
+DATA_FILES = {
+    'data/all_fin_service': 'data/all_fin_service.csv',
+    'data/all_national': 'data/all_national.csv',
+    'data/billing': 'data/billing.csv',
+    'data/production': 'data/production.csv',
+    'data/s_access': 'data/s_access.csv',
+    'data/s_service': 'data/s_service.csv',
+    'data/water_access': 'data/water_access.csv',
+    'data/water_service': 'data/water_service.csv',
+}
+
+DATE_COLUMNS = {
+    'data/all_fin_service': ('date_MMYY', '%b/%y'),
+    'data/all_national': ('date_YY', '%Y'),
+    'data/billing': ('date', '%Y-%m-%d'),
+    'data/production': ('date_YYMMDD', '%Y/%m/%d'),
+    'data/s_access': ('date_YY', '%Y'),
+    'data/s_service': ('date_MMYY', '%b/%y'),
+    'data/water_access': ('date_YY', '%Y'),
+    'data/water_service': ('date_MMYY', '%b/%y'),
+}
+
+@st.cache_data(show_spinner=False, persist="disk")
+def load_data():
+    # pandas' C parser releases the GIL, so the eight CSVs can be read concurrently
+    with ThreadPoolExecutor(max_workers=len(DATA_FILES)) as executor:
+        result = dict(zip(DATA_FILES, executor.map(pd.read_csv, DATA_FILES.values())))
+
+    # Removing duplicate header rows that may exist in the data
+    billing = result['data/billing']
+    result['data/billing'] = billing[billing['date'] != 'date'].reset_index(drop=True)
+
+    for key, (date_col, date_format) in DATE_COLUMNS.items():
+        result[key][date_col] = pd.to_datetime(result[key][date_col], format=date_format)
+
+    # The schema is fixed once loaded, so record which datasets carry a country column
+    country_keys = tuple(k for k, df in result.items() if 'country' in df.columns)
+    for k in country_keys:
+        result[k]['country'] = result[k]['country'].str.title()
+
+    # One long country/year frame for the sidebar filter domain instead of scanning each dataset
+    filter_index = pd.DataFrame({
+        'country': pd.concat([result[k]['country'] for k in country_keys], ignore_index=True).astype('category'),
+        'year': np.concatenate([result[k][DATE_COLUMNS[k][0]].dt.year.to_numpy(np.int16) for k in country_keys]),
+    })
+
+    return result, country_keys, filter_index
+
+@st.cache_data(show_spinner=False)
+def get_filter_domain():
+    # Countries and years only change when the data does, so compute them once
+    _, _, filter_index = load_data()
+    sorted_countries = tuple(filter_index['country'].cat.categories)
+    return sorted_countries, (int(filter_index['year'].min()), int(filter_index['year'].max()))
+
 # --- SEARCH UTILITY FUNCTIONS ---
 @st.cache_data
 def get_column_types(df):
@@ -235,6 +290,154 @@ def reset_search_view():
     # Resets the search results view flag
     st.session_state.show_index_search = False
 
+@st.fragment
+def search_panel(data):
+    # Sidebar search inputs run as a fragment: picking a dataset, column or
+    # operator only reruns this panel instead of the whole page
+    # --- Global Data Search (Action-driven) ---
+    st.markdown("---")
+    st.subheader("Search 🔍")
+    
+    # 1. Search Mode Selection
+    search_mode = st.radio(
+        "Select Search Mode",
+        options=['Simple Keyword Search', 'Targeted Filter (One Dataset)'],
+        key="search_mode",
+        help="Simple search checks all text and date fields across all files. Targeted filter allows precise filtering on one file/column."
+    )
+    
+    # Init session state for filter values
+    if 'comparison_value' not in st.session_state: st.session_state['comparison_value'] = ""
+    if 'selected_column' not in st.session_state: st.session_state['selected_column'] = None
+    if 'selected_dataset' not in st.session_state: st.session_state['selected_dataset'] = None
+    if 'selected_operator' not in st.session_state: st.session_state['selected_operator'] = None
+
+    
+    # --- Simple Search Inputs ---
+    if search_mode == 'Simple Keyword Search':
+        st.text_input(
+            "Enter Keyword/Value", 
+            placeholder="e.g., 'Lesotho', '2023-08', '0.98'",
+            key="comparison_value",
+            help="Searches this value in all text/date fields across every dataset."
+        )
+
+    # --- Targeted Filter Inputs (Conditional) ---
+    else:
+        # Level 1: Dataset Selection
+        dataset_options = [""] + sorted(data.keys())
+        st.selectbox(
+            "1. Select Dataset", 
+            options=dataset_options,
+            key="selected_dataset",
+            index=0,
+            help="Choose the specific data file you want to drill into."
+        )
+        
+        # Determine column options and types based on selected dataset
+        column_options = [""]
+        col_types = {}
+        if st.session_state.selected_dataset and st.session_state.selected_dataset in data:
+            current_df = data[st.session_state.selected_dataset]
+            column_options = [""] + sorted(current_df.columns.tolist())
+            col_types = get_column_types(current_df)
+            
+        # Level 2: Column Selection
+        st.selectbox(
+            "2. Select Column", 
+            options=column_options,
+            key="selected_column",
+            index=0,
+            help="Choose the specific column you wish to filter."
+        )
+
+        # Level 3 & 4: Operator and Value (Conditional)
+        if st.session_state.selected_column and st.session_state.selected_column in col_types:
+            col_type = col_types[st.session_state.selected_column]
+            
+            # --- Operator Selection Logic ---
+            if col_type == 'numeric':
+                operator_options = ['>= (Greater than or equal to)', '<= (Less than or equal to)', '== (Equal to)']
+                input_type = 'number'
+                input_placeholder = "e.g., 100000, 0.95"
+            elif col_type == 'text':
+                operator_options = ['contains', 'starts with', 'ends with']
+                input_type = 'text'
+                input_placeholder = "e.g., Kenya, treatment"
+            elif col_type == 'datetime':
+                operator_options = ['Date contains YYYY-MM-DD']
+                input_type = 'text'
+                input_placeholder = "e.g., 2023-08"
+            else:
+                operator_options = []
+                input_type = 'text'
+                input_placeholder = ""
+
+            st.selectbox(
+                "3. Select Operator", 
+                options=operator_options,
+                key="selected_operator",
+                help=f"Operators specific to {col_type} data."
+            )
+            
+            # --- Comparison Value Input (Type-aware) ---
+            if input_type == 'number':
+                st.number_input(
+                    "4. Enter Comparison Value", 
+                    placeholder=input_placeholder,
+                    key="comparison_value",
+                    step=0.01,
+                    help="Enter the numeric value for comparison."
+                )
+            else:
+                st.text_input(
+                    "4. Enter Comparison Value", 
+                    placeholder=input_placeholder,
+                    key="comparison_value",
+                    help="Enter the text or date value for comparison."
+                )
+            
+        else:
+            # Clear operator/value if column is unselected
+            st.session_state.selected_operator = None
+            st.session_state.comparison_value = ""
+
+
+    # Init session state for search flag
+    if 'show_index_search' not in st.session_state:
+        st.session_state['show_index_search'] = False
+
+    # Callback to trigger search and set flag
+    def trigger_search():
+        if st.session_state.search_mode == 'Simple Keyword Search' and st.session_state.comparison_value:
+            st.session_state.show_index_search = True
+        elif st.session_state.search_mode == 'Targeted Filter (One Dataset)' and st.session_state.selected_dataset and st.session_state.selected_column and st.session_state.comparison_value:
+            st.session_state.show_index_search = True
+        else:
+            # Reset search if criteria are insufficient
+            st.session_state.show_index_search = False
+
+            
+    # Button to execute search; the page body only reads the search flag on a
+    # full run, so escalate from the fragment rerun to an app rerun
+    if st.button(
+        "Search", 
+        on_click=trigger_search, 
+        type="primary",
+        use_container_width=True
+    ):
+        st.rerun()
+    
+    # Logic to clear search results if inputs are cleared
+    was_showing_search = st.session_state.show_index_search
+    if st.session_state.search_mode == 'Simple Keyword Search' and not st.session_state.comparison_value:
+        st.session_state.show_index_search = False
+    elif st.session_state.search_mode == 'Targeted Filter (One Dataset)' and (not st.session_state.selected_dataset or not st.session_state.selected_column or not st.session_state.comparison_value):
+        st.session_state.show_index_search = False
+
+    if was_showing_search and not st.session_state.show_index_search:
+        st.rerun()
+
 if st.session_state["authentication_status"] is None:
     show_login_page(authenticator, config)
             
@@ -249,46 +452,8 @@ elif st.session_state["authentication_status"]:
     st.session_state['user_role'] = user_role
     st.session_state['user_country'] = user_country
 
-    @st.cache_data
-    def load_data(): 
-        all_fin_service = pd.read_csv('data/all_fin_service.csv')
-        all_national = pd.read_csv('data/all_national.csv')
-        billing = pd.read_csv('data/billing.csv')
-        production = pd.read_csv('data/production.csv')
-        s_access = pd.read_csv('data/s_access.csv')
-        s_service = pd.read_csv('data/s_service.csv')
-        w_access = pd.read_csv('data/water_access.csv')
-        w_service = pd.read_csv('data/water_service.csv')
-        
-        # Removing duplicate header rows that may exist in the data
-        billing = billing[billing['date'] != 'date'].reset_index(drop=True)
-
-        all_fin_service['date_MMYY'] = pd.to_datetime(all_fin_service['date_MMYY'], format='%b/%y')
-        all_national['date_YY'] = pd.to_datetime(all_national['date_YY'], format='%Y')
-        billing['date'] = pd.to_datetime(billing['date'], format='%Y-%m-%d')
-        production['date_YYMMDD'] = pd.to_datetime(production['date_YYMMDD'], format='%Y/%m/%d')
-        s_access['date_YY'] = pd.to_datetime(s_access['date_YY'], format='%Y')
-        s_service['date_MMYY'] = pd.to_datetime(s_service['date_MMYY'], format='%b/%y')
-        w_access['date_YY'] = pd.to_datetime(w_access['date_YY'], format='%Y')
-        w_service['date_MMYY'] = pd.to_datetime(w_service['date_MMYY'], format='%b/%y')
-
-        dfs_to_normalize = [all_fin_service, all_national, billing, production, s_access, s_service, w_access, w_service]
-        for df in dfs_to_normalize:
-            if 'country' in df.columns:
-                df['country'] = df['country'].str.title()
-
-        return {
-            'data/all_fin_service': all_fin_service,
-            'data/all_national': all_national,
-            'data/billing': billing,
-            'data/production': production,
-            'data/s_access': s_access,
-            'data/s_service': s_service,
-            'data/water_access': w_access,
-            'data/water_service': w_service
-        }
-
-    data = load_data()
+    data, _, _ = load_data()
+    sorted_countries, (min_year, max_year) = get_filter_domain()
     st.session_state['data'] = data # Store data for global search use
 
     with st.sidebar:
@@ -329,11 +494,6 @@ elif st.session_state["authentication_status"]:
         st.markdown("---")
         st.subheader("Global Filters")
 
-        all_countries = set() 
-        for df in data.values(): 
-            if "country" in df.columns: 
-                all_countries.update(df["country"].unique())
-
         if user_role == 'admin':
             if page == "Executive Overview":
                 default_countries = []  # Empty for Executive Overview
@@ -342,7 +502,7 @@ elif st.session_state["authentication_status"]:
                 
             selected_countries = st.multiselect( 
                 "Select Countries", 
-                options=sorted(all_countries),
+                options=sorted_countries,
                 default=default_countries,
                 help="As an admin, you can view data from all countries"   
             )
@@ -357,160 +517,14 @@ elif st.session_state["authentication_status"]:
         else:
             selected_countries = []
 
-        all_years = []
-        for df_name, df in data.items(): 
-            if "date_YY" in df.columns: 
-                all_years.extend(df["date_YY"].dt.year.unique())
-            elif "date_MMYY" in df.columns: 
-                all_years.extend(df["date_MMYY"].dt.year.unique())
-            elif "date_YYMMDD" in df.columns: 
-                all_years.extend(df["date_YYMMDD"].dt.year.unique())
-        
-        if all_years:
-            year_range = st.slider(
-                "Select Year Range", 
-                min_value=int(min(all_years)),
-                max_value=int(max(all_years)),
-                value=(int(min(all_years)), int(max(all_years)))
-            )
-
-        # --- Global Data Search (Action-driven) ---
-        st.markdown("---")
-        st.subheader("Search 🔍")
-        
-        # 1. Search Mode Selection
-        search_mode = st.radio(
-            "Select Search Mode",
-            options=['Simple Keyword Search', 'Targeted Filter (One Dataset)'],
-            key="search_mode",
-            help="Simple search checks all text and date fields across all files. Targeted filter allows precise filtering on one file/column."
+        year_range = st.slider(
+            "Select Year Range", 
+            min_value=min_year,
+            max_value=max_year,
+            value=(min_year, max_year)
         )
-        
-        # Init session state for filter values
-        if 'comparison_value' not in st.session_state: st.session_state['comparison_value'] = ""
-        if 'selected_column' not in st.session_state: st.session_state['selected_column'] = None
-        if 'selected_dataset' not in st.session_state: st.session_state['selected_dataset'] = None
-        if 'selected_operator' not in st.session_state: st.session_state['selected_operator'] = None
-
-        
-        # --- Simple Search Inputs ---
-        if search_mode == 'Simple Keyword Search':
-            st.text_input(
-                "Enter Keyword/Value", 
-                placeholder="e.g., 'Lesotho', '2023-08', '0.98'",
-                key="comparison_value",
-                help="Searches this value in all text/date fields across every dataset."
-            )
-
-        # --- Targeted Filter Inputs (Conditional) ---
-        else:
-            # Level 1: Dataset Selection
-            dataset_options = [""] + sorted(data.keys())
-            st.selectbox(
-                "1. Select Dataset", 
-                options=dataset_options,
-                key="selected_dataset",
-                index=0,
-                help="Choose the specific data file you want to drill into."
-            )
-            
-            # Determine column options and types based on selected dataset
-            column_options = [""]
-            col_types = {}
-            if st.session_state.selected_dataset and st.session_state.selected_dataset in data:
-                current_df = data[st.session_state.selected_dataset]
-                column_options = [""] + sorted(current_df.columns.tolist())
-                col_types = get_column_types(current_df)
-                
-            # Level 2: Column Selection
-            st.selectbox(
-                "2. Select Column", 
-                options=column_options,
-                key="selected_column",
-                index=0,
-                help="Choose the specific column you wish to filter."
-            )
 
-            # Level 3 & 4: Operator and Value (Conditional)
-            if st.session_state.selected_column and st.session_state.selected_column in col_types:
-                col_type = col_types[st.session_state.selected_column]
-                
-                # --- Operator Selection Logic ---
-                if col_type == 'numeric':
-                    operator_options = ['>= (Greater than or equal to)', '<= (Less than or equal to)', '== (Equal to)']
-                    input_type = 'number'
-                    input_placeholder = "e.g., 100000, 0.95"
-                elif col_type == 'text':
-                    operator_options = ['contains', 'starts with', 'ends with']
-                    input_type = 'text'
-                    input_placeholder = "e.g., Kenya, treatment"
-                elif col_type == 'datetime':
-                    operator_options = ['Date contains YYYY-MM-DD']
-                    input_type = 'text'
-                    input_placeholder = "e.g., 2023-08"
-                else:
-                    operator_options = []
-                    input_type = 'text'
-                    input_placeholder = ""
-
-                st.selectbox(
-                    "3. Select Operator", 
-                    options=operator_options,
-                    key="selected_operator",
-                    help=f"Operators specific to {col_type} data."
-                )
-                
-                # --- Comparison Value Input (Type-aware) ---
-                if input_type == 'number':
-                    st.number_input(
-                        "4. Enter Comparison Value", 
-                        placeholder=input_placeholder,
-                        key="comparison_value",
-                        step=0.01,
-                        help="Enter the numeric value for comparison."
-                    )
-                else:
-                    st.text_input(
-                        "4. Enter Comparison Value", 
-                        placeholder=input_placeholder,
-                        key="comparison_value",
-                        help="Enter the text or date value for comparison."
-                    )
-                
-            else:
-                # Clear operator/value if column is unselected
-                st.session_state.selected_operator = None
-                st.session_state.comparison_value = ""
-
-
-        # Init session state for search flag
-        if 'show_index_search' not in st.session_state:
-            st.session_state['show_index_search'] = False
-
-        # Callback to trigger search and set flag
-        def trigger_search():
-            if st.session_state.search_mode == 'Simple Keyword Search' and st.session_state.comparison_value:
-                st.session_state.show_index_search = True
-            elif st.session_state.search_mode == 'Targeted Filter (One Dataset)' and st.session_state.selected_dataset and st.session_state.selected_column and st.session_state.comparison_value:
-                st.session_state.show_index_search = True
-            else:
-                # Reset search if criteria are insufficient
-                st.session_state.show_index_search = False
-
-                
-        # Button to execute search
-        st.button(
-            "Search", 
-            on_click=trigger_search, 
-            type="primary",
-            use_container_width=True
-        )
-        
-        # Logic to clear search results if inputs are cleared
-        if st.session_state.search_mode == 'Simple Keyword Search' and not st.session_state.comparison_value:
-            st.session_state.show_index_search = False
-        elif st.session_state.search_mode == 'Targeted Filter (One Dataset)' and (not st.session_state.selected_dataset or not st.session_state.selected_column or not st.session_state.comparison_value):
-            st.session_state.show_index_search = False
+        search_panel(data)
 
         # st.markdown("---")
         # ---------------------------------------------
@@ -559,7 +573,7 @@ elif st.session_state["authentication_status"]:
 
             if st.button("Ask the Bot"):
                 if user_query.strip():
-                    answer = bot.answer(user_query)
+                    answer = get_bot().answer(user_query)
                     st.session_state.chat_history.append(("You", user_query))
                     st.session_state.chat_history.append(("Bot", answer))
 
@@ -594,20 +608,23 @@ elif st.session_state["authentication_status"]:
 
     # PDF_PATH = "assets/report.pdf"
 
+    # @st.cache_data
+    # def load_report_pdf(path, mtime, size):
+    #     # mtime/size are only part of the cache key so a replaced PDF is re-read
+    #     with open(path, "rb") as pdf_file:
+    #         return pdf_file.read()
+
     # with st.sidebar:
     #     st.markdown("---")
     #     try:
-    #         if os.path.exists(PDF_PATH):
-    #             with open(PDF_PATH, "rb") as pdf_file:
-    #                 st.download_button(
-    #                     label="📄 Download Report PDF",
-    #                     data=pdf_file,
-    #                     file_name="Water_Utility_Report.pdf",
-    #                     mime="application/pdf",
-    #                 )
-    #         else:
-    #             st.warning("📄 Report PDF not available")
-    #     except Exception as e:
+    #         pdf_stat = os.stat(PDF_PATH)
+    #         st.download_button(
+    #             label="📄 Download Report PDF",
+    #             data=load_report_pdf(PDF_PATH, pdf_stat.st_mtime, pdf_stat.st_size),
+    #             file_name="Water_Utility_Report.pdf",
+    #             mime="application/pdf",
+    #         )
+    #     except OSError:
     #         st.warning("📄 Report PDF not available")
 
             
@@ -2,26 +2,316 @@
 
 import streamlit as st
 import pandas as pd
-import altair as alt
+import numpy as np
+
+
+# Narrow dtypes for the numeric columns the page uses: shares are 0-100 and
+# zone populations fit comfortably in uint32. Columns missing from one of
+# the files are simply ignored by read_csv.
+ACCESS_DTYPES = {
+    "popn_total": "uint32",
+    **{
+        col: "float32"
+        for col in (
+            "safely_managed_pct",
+            "basic_pct",
+            "limited_pct",
+            "unimproved_pct",
+            "surface_water_pct",
+            "open_def_pct",
+            "other_pct",
+        )
+    },
+}
 
 
 @st.cache_data
 def load_access_data():
     """Load and clean water & sanitation access data."""
-    water = pd.read_csv("data/water_access.csv")
-    san = pd.read_csv("data/s_access.csv")
+    # pyarrow's multithreaded CSV reader (already installed with streamlit)
+    water = pd.read_csv("data/water_access.csv", engine="pyarrow", dtype=ACCESS_DTYPES)
+    san = pd.read_csv("data/s_access.csv", engine="pyarrow", dtype=ACCESS_DTYPES)
 
     # Normalise country names and create a numeric year column
     for df in (water, san):
         if "country" in df.columns:
             df["country"] = df["country"].astype(str).str.title()
 
-        df["date_YY"] = pd.to_datetime(df["date_YY"], format="%Y")
-        df["year"] = df["date_YY"].dt.year
+        # date_YY is already a plain YYYY integer; no datetime round-trip needed
+        df["year"] = df.pop("date_YY").astype("int16")
+
+        # Combined label used by the zone filter; static, so build it once here
+        df["country_zone"] = (df["country"] + " – " + df["zone"]).astype("category")
+
+        # Low-cardinality labels: categorical codes make isin/groupby/unique cheaper
+        for col in ("country", "zone"):
+            df[col] = df[col].astype("category")
+
+    return water, san
+
+
+# ----------------------------------------------------
+# Service ladders: display label -> percentage column
+# ----------------------------------------------------
+WATER_LADDER = {
+    "Safely managed": "safely_managed_pct",
+    "Basic": "basic_pct",
+    "Limited": "limited_pct",
+    "Unimproved": "unimproved_pct",
+    "Surface water": "surface_water_pct",
+}
+
+SAN_LADDER = {
+    "Safely managed": "safely_managed_pct",
+    "Basic": "basic_pct",
+    "Limited": "limited_pct",
+    "Unimproved": "unimproved_pct",
+    "Open defecation": "open_def_pct",
+}
+
+
+# ----------------------------------------------------
+# Chart specs: plain Vega-Lite dicts, so reruns skip Altair's
+# schema validation and to_dict() serialisation
+# ----------------------------------------------------
+# Tooltip field lists are built once here; the zone-level charts share the
+# leading country/zone fields
+LOCATION_TOOLTIP = (
+    {"field": "country", "type": "nominal"},
+    {"field": "zone", "type": "nominal"},
+)
+
+LADDER_TOOLTIP = [
+    *LOCATION_TOOLTIP,
+    {"field": "Service level", "type": "nominal"},
+    {"field": "pct", "type": "quantitative", "format": ".1f"},
+]
+
+GAP_TOOLTIP = [
+    *LOCATION_TOOLTIP,
+    {
+        "field": "safe_water_pct",
+        "type": "quantitative",
+        "format": ".1f",
+        "title": "Water safely managed (%)",
+    },
+    {
+        "field": "safe_san_pct",
+        "type": "quantitative",
+        "format": ".1f",
+        "title": "Sanitation safely managed (%)",
+    },
+    {
+        "field": "water_san_gap_pct",
+        "type": "quantitative",
+        "format": ".1f",
+        "title": "Gap (W - S)",
+    },
+]
+
+TREND_TOOLTIP = [
+    {"field": "Year", "type": "quantitative"},
+    {"field": "Service", "type": "nominal"},
+    {"field": "Safe_pct", "type": "quantitative", "format": ".1f"},
+]
+
+LADDER_CHART_SPEC = {
+    "mark": "bar",
+    "encoding": {
+        "x": {"field": "zone", "type": "nominal", "title": "Zone"},
+        "y": {
+            "field": "share",
+            "type": "quantitative",
+            "stack": True,
+            "title": "Share of population",
+            "axis": {"format": "%"},
+        },
+        "color": {"field": "Service level", "type": "nominal", "title": "Service level"},
+        "tooltip": LADDER_TOOLTIP,
+    },
+    "height": 350,
+}
+
+GAP_CHART_SPEC = {
+    "mark": "bar",
+    "encoding": {
+        "y": {"field": "zone", "type": "nominal", "title": "Zone", "sort": "-x"},
+        "x": {
+            "field": "water_san_gap_pct",
+            "type": "quantitative",
+            "title": "Water – Sanitation safely managed (percentage points)",
+        },
+        "color": {
+            "condition": {
+                "test": "datum.water_san_gap_pct >= 0",
+                "value": "#4caf50",  # water ahead of sanitation
+            },
+            "value": "#f44336",  # sanitation ahead of water
+        },
+        "tooltip": GAP_TOOLTIP,
+    },
+    "height": 350,
+}
+
+TREND_CHART_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": {"field": "Year", "type": "ordinal"},
+        "y": {"field": "Safe_pct", "type": "quantitative", "title": "Safely managed (%)"},
+        "color": {"field": "Service", "type": "nominal"},
+        "tooltip": TREND_TOOLTIP,
+    },
+    "height": 350,
+}
+
+
+def ladder_shares(long_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Normalise a melted ladder frame per zone on the server, so the browser
+    only stacks precomputed shares and receives just the charted columns.
+    """
+    zone_totals = long_df.groupby("zone", observed=True)["pct"].transform("sum")
+    share = (long_df["pct"] / zone_totals).where(zone_totals != 0, 0.0)
+    return long_df[["country", "zone", "Service level", "pct"]].assign(share=share)
+
+
+def pop_weighted_pcts(df: pd.DataFrame, pct_cols: list) -> dict:
+    """Population-weighted averages of several percentage columns in one pass."""
+    if df.empty or "popn_total" not in df.columns:
+        return {col: 0.0 for col in pct_cols}
+    weights = df["popn_total"].to_numpy(dtype="float64")
+    if weights.sum() == 0:
+        return {col: 0.0 for col in pct_cols}
+    totals = np.average(df[pct_cols].to_numpy(dtype="float64"), axis=0, weights=weights)
+    return {col: float(val) for col, val in zip(pct_cols, totals)}
+
+
+@st.cache_data
+def filter_access_data(selected_countries: tuple, year_range: tuple):
+    """Apply the global country & year-range filters."""
+    water, san = load_access_data()
+
+    if selected_countries:
+        water = water[water["country"].isin(selected_countries)]
+        san = san[san["country"].isin(selected_countries)]
+
+    start_year, end_year = year_range
+    water = water[(water["year"] >= start_year) & (water["year"] <= end_year)]
+    san = san[(san["year"] >= start_year) & (san["year"] <= end_year)]
 
     return water, san
 
 
+@st.cache_data
+def prepare_access_views(selected_countries: tuple, year_range: tuple, selected_zones: tuple):
+    """
+    Build the latest-year frames behind the Overview view for one set of
+    filters, so reruns with unchanged filters skip the filtering and melts.
+    """
+    water, san = filter_access_data(selected_countries, year_range)
+
+    # Cross-sectional views use the latest year in the selected range
+    current_year = year_range[1]
+    w_year_zone = water[(water["year"] == current_year) & water["country_zone"].isin(selected_zones)]
+    s_year_zone = san[(san["year"] == current_year) & san["country_zone"].isin(selected_zones)]
+
+    # Relabel the ladder columns before melting, so the melt emits the
+    # display labels directly instead of a per-row dict lookup afterwards
+    water_long = w_year_zone.rename(
+        columns={v: k for k, v in WATER_LADDER.items()}
+    ).melt(
+        id_vars=["country", "zone"],
+        value_vars=list(WATER_LADDER.keys()),
+        var_name="Service level",
+        value_name="pct",
+    )
+
+    san_long = s_year_zone.rename(
+        columns={v: k for k, v in SAN_LADDER.items()}
+    ).melt(
+        id_vars=["country", "zone"],
+        value_vars=list(SAN_LADDER.keys()),
+        var_name="Service level",
+        value_name="pct",
+    )
+
+    water_long = ladder_shares(water_long)
+    san_long = ladder_shares(san_long)
+
+    return w_year_zone, s_year_zone, water_long, san_long
+
+
+@st.cache_data
+def build_priority_table(selected_countries: tuple, year_range: tuple, selected_zones: tuple):
+    """Latest-year water vs sanitation table behind the Gaps & Priorities view."""
+    w_year_zone, s_year_zone, _, _ = prepare_access_views(
+        selected_countries, year_range, selected_zones
+    )
+
+    # Both frames hold a single year, so align water + sanitation on the
+    # (country, zone) index instead of building a merge hash table
+    san_idx = s_year_zone.set_index(["country", "zone"])[
+        ["safely_managed_pct", "open_def_pct"]
+    ].rename(columns={"safely_managed_pct": "safe_san_pct"})
+
+    pri = (
+        w_year_zone.set_index(["country", "zone"])[
+            [
+                "year",
+                "popn_total",
+                "safely_managed_pct",
+                "basic_pct",
+                "limited_pct",
+                "unimproved_pct",
+                "surface_water_pct",
+            ]
+        ]
+        .rename(columns={"safely_managed_pct": "safe_water_pct"})
+        .join(san_idx, how="left")
+        .reset_index()
+        .assign(
+            no_basic_water_pct=lambda d: (
+                d["limited_pct"] + d["unimproved_pct"] + d["surface_water_pct"]
+            ),
+            water_san_gap_pct=lambda d: d["safe_water_pct"] - d["safe_san_pct"],
+            # Simple priority score: no-basic water + open defecation
+            priority_score=lambda d: d["no_basic_water_pct"] + d["open_def_pct"],
+        )
+    )
+
+    return pri
+
+
+@st.cache_data
+def build_access_trend(selected_countries: tuple, year_range: tuple, selected_zones: tuple):
+    """Population-weighted safely managed % per year behind the Trends view."""
+    water, san = filter_access_data(selected_countries, year_range)
+
+    # Use ALL years in the selected range, but only selected zones
+    water_sel = water[water["country_zone"].isin(selected_zones)]
+    san_sel = san[san["country_zone"].isin(selected_zones)]
+
+    # One groupby per service
+    trend_parts = []
+    for service, sel in (("Water", water_sel), ("Sanitation", san_sel)):
+        yearly = (
+            sel.assign(wp=sel["safely_managed_pct"] * sel["popn_total"])
+            .groupby("year", sort=True)
+            .agg(num=("wp", "sum"), den=("popn_total", "sum"))
+        )
+        trend_parts.append(
+            pd.DataFrame(
+                {
+                    "Year": yearly.index,
+                    "Service": service,
+                    "Safe_pct": (yearly["num"] / yearly["den"]).where(yearly["den"] != 0, 0.0).to_numpy(),
+                }
+            )
+        )
+
+    return pd.concat(trend_parts, ignore_index=True).sort_values("Year", kind="stable")
+
+
 def render_access_page(selected_countries, year_range):
     """
     Access to Water & Sanitation page.
@@ -36,27 +326,20 @@ def render_access_page(selected_countries, year_range):
 
     st.title("Access to Water & Sanitation")
 
-    water, san = load_access_data()
+    # Tuples keep the filters hashable for the cached helpers below
+    selected_countries = tuple(selected_countries) if selected_countries else ()
+    year_range = tuple(year_range)
 
-    # ----------------------------------------------------
-    # Apply GLOBAL filters: country (can be multi) & year range
-    # ----------------------------------------------------
-    if selected_countries:
-        water = water[water["country"].isin(selected_countries)]
-        san = san[san["country"].isin(selected_countries)]
-
-    start_year, end_year = year_range
-    water = water[(water["year"] >= start_year) & (water["year"] <= end_year)]
-    san = san[(san["year"] >= start_year) & (san["year"] <= end_year)]
+    water, san = filter_access_data(selected_countries, year_range)
 
     if water.empty or san.empty:
         st.warning("No access data for the current global filters.")
         return
 
     # For cross-sectional views, use the latest year in the selected range
-    current_year = end_year
-    w_year = water[water["year"] == current_year].copy()
-    s_year = san[san["year"] == current_year].copy()
+    current_year = year_range[1]
+    w_year = water[water["year"] == current_year]
+    s_year = san[san["year"] == current_year]
 
     if w_year.empty or s_year.empty:
         st.warning(f"No access data for year {current_year}. Try expanding the year range.")
@@ -66,10 +349,6 @@ def render_access_page(selected_countries, year_range):
     # LOCAL filter: Zones
     # (we keep country from global filters, but show combined label for clarity)
     # ----------------------------------------------------
-    w_year["country_zone"] = w_year["country"] + " – " + w_year["zone"]
-    s_year["country_zone"] = s_year["country"] + " – " + s_year["zone"]
-
-
     zone_labels = sorted(w_year["country_zone"].unique())
 
     selected_zone_labels = st.multiselect(
@@ -82,48 +361,50 @@ def render_access_page(selected_countries, year_range):
     if not selected_zone_labels:
         selected_zone_labels = zone_labels
 
-    w_year_zone = w_year[w_year["country_zone"].isin(selected_zone_labels)]
-    s_year_zone = s_year[s_year["country_zone"].isin(selected_zone_labels)]
-
-    # ----------------------------------------------------
-    # Helper: population-weighted percentage
-    # ----------------------------------------------------
-    def pop_weighted_pct(df: pd.DataFrame, pct_col: str) -> float:
-        """Population-weighted average of a percentage column."""
-        if df.empty or "popn_total" not in df.columns:
-            return 0.0
-        total_pop = df["popn_total"].sum()
-        if total_pop == 0:
-            return 0.0
-        return float((df[pct_col] * df["popn_total"]).sum() / total_pop)
+    selected_zone_labels = tuple(selected_zone_labels)
 
     # ----------------------------------------------------
-    # Tabs to keep layout organised
+    # View switcher to keep layout organised. Unlike st.tabs, only the
+    # selected view runs, so hidden views cost nothing on a rerun.
     # ----------------------------------------------------
-    tab_overview, tab_gaps, tab_trends = st.tabs(
-        ["Overview", "Gaps & Priorities", "Trends"]
+    active_view = st.radio(
+        "View",
+        ["Overview", "Gaps & Priorities", "Trends"],
+        horizontal=True,
+        key="active_access_tab",
+        label_visibility="collapsed",
     )
 
     # ====================================================
-    # TAB 1: OVERVIEW
+    # VIEW 1: OVERVIEW
     # ====================================================
-    with tab_overview:
+    if active_view == "Overview":
+        w_year_zone, s_year_zone, water_long, san_long = prepare_access_views(
+            selected_countries, year_range, selected_zone_labels
+        )
+
         st.markdown(f"### Overview for **{current_year}**")
 
         # ---------- KPIs ----------
         kpi_cols = st.columns(4)
 
-        water_safe_pct = pop_weighted_pct(w_year_zone, "safely_managed_pct")
-        san_safe_pct = pop_weighted_pct(s_year_zone, "safely_managed_pct")
+        water_kpis = pop_weighted_pcts(
+            w_year_zone,
+            ["safely_managed_pct", "limited_pct", "unimproved_pct", "surface_water_pct"],
+        )
+        san_kpis = pop_weighted_pcts(s_year_zone, ["safely_managed_pct", "open_def_pct"])
+
+        water_safe_pct = water_kpis["safely_managed_pct"]
+        san_safe_pct = san_kpis["safely_managed_pct"]
 
         # “No basic water” = limited + unimproved + surface water
         no_basic_water_pct = (
-            pop_weighted_pct(w_year_zone, "limited_pct")
-            + pop_weighted_pct(w_year_zone, "unimproved_pct")
-            + pop_weighted_pct(w_year_zone, "surface_water_pct")
+            water_kpis["limited_pct"]
+            + water_kpis["unimproved_pct"]
+            + water_kpis["surface_water_pct"]
         )
 
-        open_def_pct = pop_weighted_pct(s_year_zone, "open_def_pct")
+        open_def_pct = san_kpis["open_def_pct"]
 
         with kpi_cols[0]:
             st.metric("Safely managed water (%)", f"{water_safe_pct:0.1f}")
@@ -142,41 +423,7 @@ def render_access_page(selected_countries, year_range):
         st.subheader("Water service ladder by zone")
 
         if not w_year_zone.empty:
-            ladder_map_w = {
-                "Safely managed": "safely_managed_pct",
-                "Basic": "basic_pct",
-                "Limited": "limited_pct",
-                "Unimproved": "unimproved_pct",
-                "Surface water": "surface_water_pct",
-            }
-
-            water_long = w_year_zone.melt(
-                id_vars=["country", "zone", "country_zone"],
-                value_vars=list(ladder_map_w.values()),
-                var_name="indicator",
-                value_name="pct",
-            )
-            inv_map_w = {v: k for k, v in ladder_map_w.items()}
-            water_long["Service level"] = water_long["indicator"].map(inv_map_w)
-
-            chart_water = (
-                alt.Chart(water_long)
-                .mark_bar()
-                .encode(
-                    x=alt.X("zone:N", title="Zone"),
-                    y=alt.Y("pct:Q", stack="normalize", title="Share of population"),
-                    color=alt.Color("Service level:N", title="Service level"),
-                    tooltip=[
-                        "country",
-                        "zone",
-                        "Service level",
-                        alt.Tooltip("pct:Q", format=".1f"),
-                    ],
-                )
-                .properties(height=350)
-            )
-
-            st.altair_chart(chart_water, use_container_width=True)
+            st.vega_lite_chart(water_long, LADDER_CHART_SPEC, use_container_width=True)
         else:
             st.info("No water access data for this selection.")
 
@@ -184,92 +431,32 @@ def render_access_page(selected_countries, year_range):
         st.subheader("Sanitation service ladder by zone")
 
         if not s_year_zone.empty:
-            ladder_map_s = {
-                "Safely managed": "safely_managed_pct",
-                "Basic": "basic_pct",
-                "Limited": "limited_pct",
-                "Unimproved": "unimproved_pct",
-                "Open defecation": "open_def_pct",
-            }
-
-            san_long = s_year_zone.melt(
-                id_vars=["country", "zone", "country_zone"],
-                value_vars=list(ladder_map_s.values()),
-                var_name="indicator",
-                value_name="pct",
-            )
-            inv_map_s = {v: k for k, v in ladder_map_s.items()}
-            san_long["Service level"] = san_long["indicator"].map(inv_map_s)
-
-            chart_san = (
-                alt.Chart(san_long)
-                .mark_bar()
-                .encode(
-                    x=alt.X("zone:N", title="Zone"),
-                    y=alt.Y("pct:Q", stack="normalize", title="Share of population"),
-                    color=alt.Color("Service level:N", title="Service level"),
-                    tooltip=[
-                        "country",
-                        "zone",
-                        "Service level",
-                        alt.Tooltip("pct:Q", format=".1f"),
-                    ],
-                )
-                .properties(height=350)
-            )
-
-            st.altair_chart(chart_san, use_container_width=True)
+            st.vega_lite_chart(san_long, LADDER_CHART_SPEC, use_container_width=True)
         else:
             st.info("No sanitation access data for this selection.")
 
     # ====================================================
-    # TAB 2: GAPS & PRIORITIES
+    # VIEW 2: GAPS & PRIORITIES
     # ====================================================
-    with tab_gaps:
+    elif active_view == "Gaps & Priorities":
+        pri = build_priority_table(selected_countries, year_range, selected_zone_labels)
+
         st.markdown(f"### Priority zones for {current_year}")
 
-        if w_year_zone.empty:
+        if pri.empty:
             st.info("No data available for the selected filters.")
         else:
-            # Combine water + sanitation metrics for the same year
-            pri = w_year_zone[
-                [
-                    "country",
-                    "zone",
-                    "year",
-                    "popn_total",
-                    "safely_managed_pct",
-                    "basic_pct",
-                    "limited_pct",
-                    "unimproved_pct",
-                    "surface_water_pct",
-                ]
-            ].copy()
-            pri = pri.rename(columns={"safely_managed_pct": "safe_water_pct"})
-
-            san_merge = s_year_zone[
-                ["country", "zone", "year", "safely_managed_pct", "open_def_pct"]
-            ].copy()
-            san_merge = san_merge.rename(columns={"safely_managed_pct": "safe_san_pct"})
-
-            pri = pri.merge(san_merge, on=["country", "zone", "year"], how="left")
-
-            pri["no_basic_water_pct"] = (
-                pri["limited_pct"]
-                + pri["unimproved_pct"]
-                + pri["surface_water_pct"]
-            )
-            pri["water_san_gap_pct"] = pri["safe_water_pct"] - pri["safe_san_pct"]
-
-            # Simple priority score: no-basic water + open defecation
-            pri["priority_score"] = pri["no_basic_water_pct"] + pri["open_def_pct"]
-            pri_sorted = pri.sort_values("priority_score", ascending=False)
-
             st.caption(
                 "Zones are ranked by a simple priority score combining "
                 "**population without basic water** and **open defecation**."
             )
 
+            # Only the top-ranked rows are sent to the browser
+            top_n = len(pri)
+            if top_n > 10:
+                top_n = st.slider("Show top N zones", 10, min(top_n, 200), min(top_n, 50))
+            pri_sorted = pri.nlargest(top_n, "priority_score")
+
             st.dataframe(
                 pri_sorted[
                     [
@@ -298,42 +485,7 @@ def render_access_page(selected_countries, year_range):
 
             st.markdown("#### Gap between water and sanitation (safely managed)")
 
-            gap_chart = (
-                alt.Chart(pri)
-                .mark_bar()
-                .encode(
-                    y=alt.Y("zone:N", title="Zone", sort="-x"),
-                    x=alt.X(
-                        "water_san_gap_pct:Q",
-                        title="Water – Sanitation safely managed (percentage points)",
-                    ),
-                    color=alt.condition(
-                        "datum.water_san_gap_pct >= 0",
-                        alt.value("#4caf50"),  # water ahead of sanitation
-                        alt.value("#f44336"),  # sanitation ahead of water
-                    ),
-                    tooltip=[
-                        "country",
-                        "zone",
-                        alt.Tooltip(
-                            "safe_water_pct:Q",
-                            format=".1f",
-                            title="Water safely managed (%)",
-                        ),
-                        alt.Tooltip(
-                            "safe_san_pct:Q",
-                            format=".1f",
-                            title="Sanitation safely managed (%)",
-                        ),
-                        alt.Tooltip(
-                            "water_san_gap_pct:Q", format=".1f", title="Gap (W - S)"
-                        ),
-                    ],
-                )
-                .properties(height=350)
-            )
-
-            st.altair_chart(gap_chart, use_container_width=True)
+            st.vega_lite_chart(pri, GAP_CHART_SPEC, use_container_width=True)
             st.caption(
                 "Positive values mean water access is ahead of sanitation; "
                 "negative values mean sanitation is ahead of water. Large gaps "
@@ -341,63 +493,15 @@ def render_access_page(selected_countries, year_range):
             )
 
     # ====================================================
-    # TAB 3: TRENDS
+    # VIEW 3: TRENDS
     # ====================================================
-    with tab_trends:
-        st.markdown("### Trend in safely managed services (water vs sanitation)")
+    else:
+        trend_df = build_access_trend(selected_countries, year_range, selected_zone_labels)
 
-        # Use ALL years in the selected range, but only selected zones
-        water_sel = water.copy()
-        san_sel = san.copy()
-
-        water_sel["country_zone"] = water_sel["country"] + " – " + water_sel["zone"]
-        san_sel["country_zone"] = san_sel["country"] + " – " + san_sel["zone"]
-
-        water_sel = water_sel[water_sel["country_zone"].isin(selected_zone_labels)]
-        san_sel = san_sel[san_sel["country_zone"].isin(selected_zone_labels)]
-
-        rows = []
-        for y in range(start_year, end_year + 1):
-            w_y = water_sel[water_sel["year"] == y]
-            s_y = san_sel[san_sel["year"] == y]
-
-            if not w_y.empty:
-                rows.append(
-                    {
-                        "Year": y,
-                        "Service": "Water",
-                        "Safe_pct": pop_weighted_pct(w_y, "safely_managed_pct"),
-                    }
-                )
-            if not s_y.empty:
-                rows.append(
-                    {
-                        "Year": y,
-                        "Service": "Sanitation",
-                        "Safe_pct": pop_weighted_pct(s_y, "safely_managed_pct"),
-                    }
-                )
-
-        trend_df = pd.DataFrame(rows)
+        st.markdown("### Trend in safely managed services (water vs sanitation)")
 
         if not trend_df.empty:
-            trend_chart = (
-                alt.Chart(trend_df)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X("Year:O"),
-                    y=alt.Y("Safe_pct:Q", title="Safely managed (%)"),
-                    color=alt.Color("Service:N"),
-                    tooltip=[
-                        "Year",
-                        "Service",
-                        alt.Tooltip("Safe_pct:Q", format=".1f"),
-                    ],
-                )
-                .properties(height=350)
-            )
-
-            st.altair_chart(trend_chart, use_container_width=True)
+            st.vega_lite_chart(trend_df, TREND_CHART_SPEC, use_container_width=True)
             st.caption(
                 "Shows overall progress in safely managed water and sanitation "
                 "for the selected zones and countries over the chosen time period."
@@ -1,145 +1,151 @@
+import re
 import streamlit as st
-import yaml
-from yaml.loader import SafeLoader
 import pandas as pd
+from collections import Counter
 from components.container import card_container
+from modules.config_store import save_config
+
+# Page CSS, built once at import with whitespace collapsed to trim the
+# payload re-sent on every rerun (Streamlit drops markup a rerun does not emit,
+# so it still has to be written each time the page renders)
+ADMIN_CSS = re.sub(r"\s+", " ", """
+    <style>
+    
+    /* User card styling */
+    .user-card {
+        background: #1a1a3d;
+        border-radius: 12px;
+        padding: 1.5rem;
+        margin-bottom: 1rem;
+        box-shadow: 0 2px 8px rgba(0, 0, 0, 0.3);
+        border-left: 4px solid #5681d0;
+        transition: transform 0.2s, box-shadow 0.2s;
+    }
+    
+    .user-card:hover {
+        transform: translateY(-2px);
+        box-shadow: 0 4px 12px rgba(86, 129, 208, 0.4);
+    }
+    
+    .user-header {
+        display: flex;
+        align-items: center;
+        margin-bottom: 1rem;
+        padding-bottom: 1rem;
+        border-bottom: 1px solid rgba(86, 129, 208, 0.3);
+    }
+    
+    .user-avatar {
+        width: 48px;
+        height: 48px;
+        border-radius: 50%;
+        background: linear-gradient(135deg, #5681d0 0%, #4a6bb8 100%);
+        display: flex;
+        align-items: center;
+        justify-content: center;
+        color: #f8f8f2;
+        font-weight: 600;
+        font-size: 1.2rem;
+        margin-right: 1rem;
+        box-shadow: 0 2px 8px rgba(86, 129, 208, 0.4);
+    }
+    
+    .user-info h4 {
+        margin: 0;
+        color: #f8f8f2;
+        font-size: 1.1rem;
+    }
+    
+    .user-info p {
+        margin: 0.25rem 0 0 0;
+        color: #f8f8f2;
+        font-size: 0.85rem;
+        opacity: 0.7;
+    }
+    
+    /* Role badge */
+    .role-badge {
+        display: inline-block;
+        padding: 0.25rem 0.75rem;
+        border-radius: 20px;
+        font-size: 0.75rem;
+        font-weight: 600;
+        text-transform: uppercase;
+        letter-spacing: 0.5px;
+    }
+    
+    .role-admin {
+        background: rgba(255, 193, 7, 0.2);
+        color: #ffc107;
+        border: 1px solid #ffc107;
+    }
+    
+    .role-country {
+        background: rgba(86, 129, 208, 0.2);
+        color: #5681d0;
+        border: 1px solid #5681d0;
+    }
+    
+    /* Section headers */
+    .section-header {
+        display: flex;
+        align-items: center;
+        margin: 2rem 0 1rem 0;
+        padding-bottom: 0.5rem;
+        border-bottom: 2px solid rgba(86, 129, 208, 0.3);
+    }
+    
+    .section-header h2 {
+        color: #f8f8f2;
+        font-size: 1.5rem;
+        margin: 0;
+    }
+    
+    /* Button improvements */
+    .stButton > button {
+        border-radius: 8px;
+        padding: 0.5rem 1.5rem;
+        font-weight: 500;
+        transition: all 0.3s;
+        background-color: #5681d0;
+        color: #f8f8f2;
+        border: none;
+    }
+    
+    .stButton > button:hover {
+        background-color: #4a6bb8;
+        box-shadow: 0 4px 12px rgba(86, 129, 208, 0.4);
+    }
+    
+    /* Select box improvements */
+    .stSelectbox > div > div {
+        border-radius: 8px;
+        background-color: #1a1a3d;
+        border-color: rgba(86, 129, 208, 0.3);
+    }
+    
+    /* Radio button styling */
+    .stRadio > div {
+        background-color: #1a1a3d;
+        padding: 0.5rem 1rem;
+        border-radius: 8px;
+    }
+    
+    /* Info box styling */
+    .stInfo {
+        background-color: rgba(86, 129, 208, 0.1);
+        border-left-color: #5681d0;
+    }
+    
+    /* Success box styling */
+    .stSuccess {
+        background-color: rgba(76, 175, 80, 0.1);
+    }
+    </style>
+""").strip()
+
 
 def show(config):
-    st.markdown("""
-        <style>
-        
-        /* User card styling */
-        .user-card {
-            background: #1a1a3d;
-            border-radius: 12px;
-            padding: 1.5rem;
-            margin-bottom: 1rem;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.3);
-            border-left: 4px solid #5681d0;
-            transition: transform 0.2s, box-shadow 0.2s;
-        }
-        
-        .user-card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(86, 129, 208, 0.4);
-        }
-        
-        .user-header {
-            display: flex;
-            align-items: center;
-            margin-bottom: 1rem;
-            padding-bottom: 1rem;
-            border-bottom: 1px solid rgba(86, 129, 208, 0.3);
-        }
-        
-        .user-avatar {
-            width: 48px;
-            height: 48px;
-            border-radius: 50%;
-            background: linear-gradient(135deg, #5681d0 0%, #4a6bb8 100%);
-            display: flex;
-            align-items: center;
-            justify-content: center;
-            color: #f8f8f2;
-            font-weight: 600;
-            font-size: 1.2rem;
-            margin-right: 1rem;
-            box-shadow: 0 2px 8px rgba(86, 129, 208, 0.4);
-        }
-        
-        .user-info h4 {
-            margin: 0;
-            color: #f8f8f2;
-            font-size: 1.1rem;
-        }
-        
-        .user-info p {
-            margin: 0.25rem 0 0 0;
-            color: #f8f8f2;
-            font-size: 0.85rem;
-            opacity: 0.7;
-        }
-        
-        /* Role badge */
-        .role-badge {
-            display: inline-block;
-            padding: 0.25rem 0.75rem;
-            border-radius: 20px;
-            font-size: 0.75rem;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }
-        
-        .role-admin {
-            background: rgba(255, 193, 7, 0.2);
-            color: #ffc107;
-            border: 1px solid #ffc107;
-        }
-        
-        .role-country {
-            background: rgba(86, 129, 208, 0.2);
-            color: #5681d0;
-            border: 1px solid #5681d0;
-        }
-        
-        /* Section headers */
-        .section-header {
-            display: flex;
-            align-items: center;
-            margin: 2rem 0 1rem 0;
-            padding-bottom: 0.5rem;
-            border-bottom: 2px solid rgba(86, 129, 208, 0.3);
-        }
-        
-        .section-header h2 {
-            color: #f8f8f2;
-            font-size: 1.5rem;
-            margin: 0;
-        }
-        
-        /* Button improvements */
-        .stButton > button {
-            border-radius: 8px;
-            padding: 0.5rem 1.5rem;
-            font-weight: 500;
-            transition: all 0.3s;
-            background-color: #5681d0;
-            color: #f8f8f2;
-            border: none;
-        }
-        
-        .stButton > button:hover {
-            background-color: #4a6bb8;
-            box-shadow: 0 4px 12px rgba(86, 129, 208, 0.4);
-        }
-        
-        /* Select box improvements */
-        .stSelectbox > div > div {
-            border-radius: 8px;
-            background-color: #1a1a3d;
-            border-color: rgba(86, 129, 208, 0.3);
-        }
-        
-        /* Radio button styling */
-        .stRadio > div {
-            background-color: #1a1a3d;
-            padding: 0.5rem 1rem;
-            border-radius: 8px;
-        }
-        
-        /* Info box styling */
-        .stInfo {
-            background-color: rgba(86, 129, 208, 0.1);
-            border-left-color: #5681d0;
-        }
-        
-        /* Success box styling */
-        .stSuccess {
-            background-color: rgba(76, 175, 80, 0.1);
-        }
-        </style>
-    """, unsafe_allow_html=True)
     
     username = st.session_state.get("username")
     user_role = config['credentials']['usernames'].get(username, {}).get('role', 'country')
@@ -154,6 +160,8 @@ def show(config):
         """, unsafe_allow_html=True)
         return
     
+    st.markdown(ADMIN_CSS, unsafe_allow_html=True)
+    
     st.markdown("""
         <div class="admin-header">
             <h1>Admin Panel</h1>
@@ -164,9 +172,14 @@ def show(config):
     
     users = config['credentials']['usernames']
     total_users = len(users)
-    admin_count = sum(1 for u in users.values() if u.get('role') == 'admin')
-    country_users = sum(1 for u in users.values() if u.get('role') == 'country')
-    assigned_users = sum(1 for u in users.values() if u.get('country') is not None)
+    # Single pass over the users for all the role/assignment counts
+    role_counts = Counter()
+    assigned_users = 0
+    for u in users.values():
+        role_counts[u.get('role')] += 1
+        assigned_users += u.get('country') is not None
+    admin_count = role_counts['admin']
+    country_users = role_counts['country']
     
     col1, col2, col3, col4 = st.columns(4)
     
@@ -262,26 +275,25 @@ def show(config):
                 with col3:
                     st.markdown("<br>", unsafe_allow_html=True)
                     if st.button("💾 Update", key=f"update_{uname}", use_container_width=True, type="primary"):
-                        config['credentials']['usernames'][uname]['role'] = new_role
-                        config['credentials']['usernames'][uname]['country'] = new_country
-                        
-                        with open('config.yaml', 'w') as file:
-                            yaml.dump(config, file, default_flow_style=False)
+                        # Only touch the file when the settings actually changed
+                        if (new_role, new_country) != (current_role, current_country):
+                            config['credentials']['usernames'][uname]['role'] = new_role
+                            config['credentials']['usernames'][uname]['country'] = new_country
+                            save_config(config)
                         
                         st.success(f"✅ Updated {name}'s settings")
                         st.rerun()
     
     with tab2:
         # Table View - More compact
-        user_data = []
+        # Build column lists directly so pandas doesn't infer/transpose per row
+        user_data = {'Username': [], 'Name': [], 'Email': [], 'Role': [], 'Country': []}
         for uname, udata in users.items():
-            user_data.append({
-                'Username': uname,
-                'Name': udata.get('name', uname),
-                'Email': udata.get('email', 'N/A'),
-                'Role': udata.get('role', 'country'),
-                'Country': udata.get('country', 'Not Assigned')
-            })
+            user_data['Username'].append(uname)
+            user_data['Name'].append(udata.get('name', uname))
+            user_data['Email'].append(udata.get('email', 'N/A'))
+            user_data['Role'].append(udata.get('role', 'country'))
+            user_data['Country'].append(udata.get('country', 'Not Assigned'))
         
         df = pd.DataFrame(user_data)
         st.dataframe(
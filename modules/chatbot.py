@@ -1,15 +1,22 @@
 # modules/smart_assistant.py
 
 import os
+import functools
 import json
+import logging
+import operator
+import re
 import toml
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 import streamlit as st
 
 from groq import Groq
 from .semantic_index import SemanticIndex
 
+log = logging.getLogger(__name__)
+
 # CONFIG = toml.load("secrets.toml")
 # GROQ_API_KEY = CONFIG["GROQ_API_KEY"]
 # client = Groq(api_key=GROQ_API_KEY)
@@ -185,95 +192,55 @@ DATASETS: Dict[str, Dict[str, Any]] = {
 }
 
 
-
-class WaterSemanticAssistant:
-    """
-    High-level assistant:
-      - no dataset/column selection by the user
-      - uses RAG + planning + execution
-    """
-
-    def __init__(self, datasets_config: Dict[str, Dict[str, Any]]):
-        self.datasets_config = datasets_config
-        self.tables: Dict[str, pd.DataFrame] = {}
-
-        # load all datasets as DataFrames
-        for name, cfg in datasets_config.items():
-            path = cfg["path"]
-            if not os.path.exists(path):
-                print(f"[Assistant] Missing dataset '{name}': {path}")
-                continue
-
-            df = pd.read_csv(path)
-            # keep dates as strings for now
-            for col in df.columns:
-                if "date" in col.lower():
-                    df[col] = df[col].astype(str)
-            self.tables[name] = df
-
-        if not self.tables:
-            raise RuntimeError("No datasets loaded for assistant.")
-
-        # build / load semantic index
-        self.semantic_index = SemanticIndex(datasets_config)
-
-
-    def _plan_query(self, question: str) -> Dict[str, Any]:
-        """
-        Use Groq to turn (question + retrieved docs) into an executable plan.
-        """
-        retrieved = self.semantic_index.retrieve(question, top_k=8)
-
-        # make a compact context for the LLM
-        context_snippets = []
-        for item in retrieved:
-            meta = item["metadata"]
-            prefix = meta.get("kind", "")
-            dataset = meta.get("dataset", "")
-            col = meta.get("column", "")
-            context_snippets.append(
-                f"[{prefix}] dataset={dataset}, column={col}\n{item['text']}"
-            )
-
-        context_text = "\n\n---\n\n".join(context_snippets)
-
-        system_msg = {
-    "role": "system",
-    "content": (
-        "You are a data analysis planner for water and sanitation datasets.\n"
-        "You see:\n"
-        "1) A user question.\n"
-        "2) Documentation about datasets and columns.\n\n"
-        "You must output ONLY a JSON object describing HOW to compute the answer.\n"
-        "Do NOT include any prose explanation. JSON only.\n\n"
-        "Planning rules:\n"
-        "- If the user asks about percentages or coverage, prefer columns whose names contain '_pct' or 'percentage'.\n"
-        "- If the question compares countries (e.g., Cameroon vs Uganda), create one metric per country,\n"
-        "  using a 'country' filter where appropriate.\n"
-        "- If the question asks about 'over the years' or 'on average', aggregate over all available years\n"
-        "  using agg='mean' on the relevant percentage column.\n"
-        "- If the user asks about a **single specific year** (e.g. 'in 2020'), either:\n"
-        "    * set time_scope.type = 'year' and time_scope.year = that year, OR\n"
-        "    * add a filter on the appropriate date column (e.g. column='date_YY', op='==', value=2020).\n"
-        "- If the user **compares two explicit years** (e.g. '2020 compared to 2022'), create **two separate metrics**:\n"
-        "    * one metric with a filter for the first year (e.g. date_YY == 2020)\n"
-        "    * and one metric with a filter for the second year (e.g. date_YY == 2022)\n"
-        "  In that case, you can keep time_scope.type = 'all'.\n"
-        "- You must use dataset and column names exactly as seen in the context snippets.\n"
-        "- Use filters to restrict by country when relevant (e.g., column='country', op='==', value='Cameroon').\n"
-    )
+# strptime formats of the date columns in DATASETS, used to derive year columns
+DATE_FORMATS: Dict[str, str] = {
+    "date": "%Y-%m-%d",
+    "date_YY": "%Y",
+    "date_MMYY": "%b/%y",
+    "date_YYMMDD": "%Y/%m/%d",
 }
 
-        user_msg = {
-            "role": "user",
-            "content": f"""
-USER QUESTION:
-{question}
-
-AVAILABLE CONTEXT (datasets and columns):
-{context_text}
+# filter ops the planner may emit -> vectorised comparison
+FILTER_OPS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
 
-TASK:
+# Rough selectivity of each filter op (lower = usually keeps fewer rows):
+# equality on things like country/zone cuts hardest, '!=' barely cuts at all
+FILTER_RANK = {"==": 0, ">": 1, ">=": 1, "<": 1, "<=": 1, "!=": 2}
+
+# Planner instructions, identical on every call. Kept entirely in the system
+# message (which is always sent first) so the provider can reuse the cached
+# prefix; only the question and retrieved context in the user message vary.
+PLAN_SYSTEM_PROMPT = (
+    "You are a data analysis planner for water and sanitation datasets.\n"
+    "You see:\n"
+    "1) A user question.\n"
+    "2) Documentation about datasets and columns.\n\n"
+    "You must output ONLY a JSON object describing HOW to compute the answer.\n"
+    "Do NOT include any prose explanation. JSON only.\n\n"
+    "Planning rules:\n"
+    "- If the user asks about percentages or coverage, prefer columns whose names contain '_pct' or 'percentage'.\n"
+    "- If the question compares countries (e.g., Cameroon vs Uganda), create one metric per country,\n"
+    "  using a 'country' filter where appropriate.\n"
+    "- If the question asks about 'over the years' or 'on average', aggregate over all available years\n"
+    "  using agg='mean' on the relevant percentage column.\n"
+    "- If the user asks about a **single specific year** (e.g. 'in 2020'), either:\n"
+    "    * set time_scope.type = 'year' and time_scope.year = that year, OR\n"
+    "    * add a filter on the appropriate date column (e.g. column='date_YY', op='==', value=2020).\n"
+    "- If the user **compares two explicit years** (e.g. '2020 compared to 2022'), create **two separate metrics**:\n"
+    "    * one metric with a filter for the first year (e.g. date_YY == 2020)\n"
+    "    * and one metric with a filter for the second year (e.g. date_YY == 2022)\n"
+    "  In that case, you can keep time_scope.type = 'all'.\n"
+    "- You must use dataset and column names exactly as seen in the context snippets.\n"
+    "- Use filters to restrict by country when relevant (e.g., column='country', op='==', value='Cameroon').\n"
+    "\n"
+    + """TASK:
 - Decide which datasets and columns to use.
 - Decide what aggregations to perform (sum, mean, etc.).
 - Infer a simple time_scope if the user mentions a year or range.
@@ -281,30 +248,30 @@ TASK:
 
 You MUST output JSON with this exact structure:
 
-{{
-  "time_scope": {{
+{
+  "time_scope": {
     "type": "all | year | range",
     "year": 2020,
     "start_year": 2018,
     "end_year": 2020
-  }},
+  },
   "metrics": [
-    {{
+    {
       "name": "string_unique_key",
       "dataset": "one_of_the_dataset_names",
       "agg": "sum | mean | max | min",
       "column": "one_column_name",
       "filters": [
-        {{"column": "col_name", "op": ">", "value": 0}}
+        {"column": "col_name", "op": ">", "value": 0}
       ]
-    }}
+    }
   ],
-  "comparison": {{
+  "comparison": {
     "type": "none | which_is_greater",
     "left_metric": "name_from_metrics_or_null",
     "right_metric": "name_from_metrics_or_null"
-  }}
-}}
+  }
+}
 
 Rules:
 - If the question clearly asks to compare two things, use type='which_is_greater'.
@@ -320,6 +287,126 @@ Rules:
 "  - 'uga_safely_managed_mean' using dataset 'water_access', column 'safely_managed_pct', agg='mean', filter country=='Uganda'\n"
 "and comparison.type='which_is_greater' with left_metric/right_metric pointing to those names.\n\n"
 
+"""
+)
+
+# wording of each aggregation in templated summaries
+AGG_LABELS = {"sum": "Total", "mean": "Average", "max": "Maximum", "min": "Minimum"}
+
+# Semantic answer cache: a new question reuses a previous answer when their
+# embeddings are at least this similar (cosine) and they mention the same numbers
+SEMANTIC_CACHE_THRESHOLD = 0.95
+SEMANTIC_CACHE_SIZE = 1000
+
+
+@st.cache_resource
+def _shared_semantic_index(cfg_key: tuple, _datasets_config: Dict[str, Dict[str, Any]]) -> SemanticIndex:
+    """
+    One semantic index (and embedding model) per server process, keyed on the
+    dataset names; every assistant instance and session reuses it.
+    """
+    return SemanticIndex(_datasets_config)
+
+
+class WaterSemanticAssistant:
+    """
+    High-level assistant:
+      - no dataset/column selection by the user
+      - uses RAG + planning + execution
+    """
+
+    def __init__(self, datasets_config: Dict[str, Dict[str, Any]]):
+        self.datasets_config = datasets_config
+        self.tables: Dict[str, pd.DataFrame] = {}
+        # date columns per dataset, found once at load instead of on every query
+        self._date_cols: Dict[str, List[str]] = {}
+        # columns already held as numbers, per dataset
+        self._numeric_cols: Dict[str, set] = {}
+
+        # datasets are read lazily on first use (see _get_table)
+        self._paths: Dict[str, str] = {}
+        for name, cfg in datasets_config.items():
+            path = cfg["path"]
+            if not os.path.exists(path):
+                print(f"[Assistant] Missing dataset '{name}': {path}")
+                continue
+            self._paths[name] = path
+
+        if not self._paths:
+            raise RuntimeError("No datasets loaded for assistant.")
+
+        # build / load semantic index (shared across instances)
+        self.semantic_index = _shared_semantic_index(
+            tuple(sorted(datasets_config)), datasets_config
+        )
+
+        # answered questions: unit embeddings (one row each), number tokens, answers
+        self._qcache_embs = np.empty((0, 0), dtype=np.float32)
+        self._qcache_numbers: List[tuple] = []
+        self._qcache_answers: List[str] = []
+
+
+    def _get_table(self, name: str) -> pd.DataFrame:
+        """Return dataset `name`, reading and preparing it on first use."""
+        if name not in self.tables:
+            self.tables[name] = self._load_table(name)
+        return self.tables[name]
+
+    def _load_table(self, name: str) -> pd.DataFrame:
+        path = self._paths[name]
+        df = pd.read_csv(path)
+        date_cols = list(df.columns[df.columns.str.contains("date", case=False, regex=False)])
+        # keep dates as strings for now (object columns already are), plus
+        # an int year sibling so time scopes compare numbers, not substrings
+        for col in date_cols:
+            if col in DATE_FORMATS:
+                df[f"{col}_year"] = (
+                    pd.to_datetime(df[col].astype(str), format=DATE_FORMATS[col], errors="coerce")
+                    .dt.year.astype("Int16")
+                )
+            if df[col].dtype != object:
+                df[col] = df[col].astype(str)
+
+        # coerce mostly-numeric text columns once, so queries can skip to_numeric
+        numeric_cols = set()
+        for col in df.columns.difference(date_cols):
+            if pd.api.types.is_numeric_dtype(df[col]):
+                numeric_cols.add(col)
+                continue
+            # probe a sample first so obvious text columns aren't parsed in full
+            if pd.to_numeric(df[col].head(100), errors="coerce").notna().mean() > 0.9:
+                converted = pd.to_numeric(df[col], errors="coerce")
+                if converted.notna().mean() > 0.9:
+                    df[col] = converted
+                    numeric_cols.add(col)
+                    continue
+            # text columns (country, zone, ...) go on the Arrow string backend:
+            # vectorised comparisons/isin instead of per-object Python compares
+            df[col] = df[col].astype("string[pyarrow]")
+
+        self._date_cols[name] = date_cols
+        self._numeric_cols[name] = numeric_cols
+        return df
+
+    def _plan_query(self, question: str, q_emb: np.ndarray = None) -> Dict[str, Any]:
+        """
+        Use Groq to turn (question + retrieved docs) into an executable plan.
+        """
+        retrieved = self.semantic_index.retrieve(question, top_k=8, embedding=q_emb)
+
+        # make a compact context for the LLM (snippets are rendered at index time)
+        context_text = "\n\n---\n\n".join(item["rendered"] for item in retrieved)
+
+        system_msg = {"role": "system", "content": PLAN_SYSTEM_PROMPT}
+
+        user_msg = {
+            "role": "user",
+            "content": f"""
+USER QUESTION:
+{question}
+
+AVAILABLE CONTEXT (datasets and columns):
+{context_text}
 """,
         }
 
@@ -344,17 +431,37 @@ Rules:
         return plan
 
 
-    def _apply_time_scope(self, df: pd.DataFrame, time_scope: Dict[str, Any]) -> pd.DataFrame:
-        """Very simple year-based filtering using any 'date' column."""
+    def _apply_time_scope(self, dataset: str, df: pd.DataFrame, time_scope: Dict[str, Any]) -> pd.DataFrame:
+        """Very simple year-based filtering using the dataset's first 'date' column."""
         ttype = time_scope.get("type", "all")
         if ttype == "all":
             return df
 
-        date_cols = [c for c in df.columns if "date" in c.lower()]
+        date_cols = self._date_cols.get(dataset, [])
         if not date_cols:
             return df
 
         col = date_cols[0]
+        year_col = f"{col}_year"
+
+        if year_col in df.columns:
+            years = df[year_col]
+            # the planner's years may be null or free text; coerce rather than raise
+            if ttype == "year":
+                year = pd.to_numeric(time_scope.get("year"), errors="coerce")
+                if pd.notna(year):
+                    return df[years == int(year)]
+                # not a number: fall through to the substring match below
+            elif ttype == "range":
+                start_year = pd.to_numeric(time_scope.get("start_year"), errors="coerce")
+                end_year = pd.to_numeric(time_scope.get("end_year"), errors="coerce")
+                if pd.isna(start_year) or pd.isna(end_year):
+                    return df.iloc[0:0]
+                return df[years.between(int(start_year), int(end_year))]
+            else:
+                return df
+
+        # unknown date format: fall back to matching the year as a substring
         s = df[col].astype(str)
 
         if ttype == "year":
@@ -372,28 +479,105 @@ Rules:
         return df
 
     def _apply_filters(self, df: pd.DataFrame, filters: List[Dict[str, Any]]) -> pd.DataFrame:
-        res = df
+        preds = []
         for f in filters:
             col = f.get("column")
             op = f.get("op")
-            val = f.get("value")
-            if col not in res.columns:
+            if col not in df.columns or op not in FILTER_OPS:
                 continue
-            series = res[col]
-
-            if op == ">":
-                res = res[series > val]
-            elif op == ">=":
-                res = res[series >= val]
-            elif op == "<":
-                res = res[series < val]
-            elif op == "<=":
-                res = res[series <= val]
-            elif op == "==":
-                res = res[series == val]
-            elif op == "!=":
-                res = res[series != val]
-        return res
+            preds.append((FILTER_RANK[op], col, FILTER_OPS[op], f.get("value")))
+        if not preds:
+            return df
+
+        # Most selective predicate first; each later one is only evaluated
+        # on the row positions that survived the ones before it
+        preds.sort(key=lambda p: p[0])
+        rows = None
+        for _, col, compare, val in preds:
+            series = df[col]
+            if (
+                isinstance(series.dtype, np.dtype) and series.dtype.kind in "iuf"
+                and isinstance(val, (int, float)) and not isinstance(val, bool)
+            ):
+                # plain numeric column vs number: compare the raw array,
+                # skipping pandas' per-op dispatch and index alignment
+                values = series.to_numpy()
+            else:
+                values = series.array
+            if rows is not None:
+                values = values[rows]
+
+            cond = compare(values, val)
+            if not isinstance(cond, np.ndarray):
+                cond = cond.to_numpy(dtype=bool, na_value=False)
+
+            rows = np.flatnonzero(cond) if rows is None else rows[cond]
+            if len(rows) == 0:
+                break
+        return df.iloc[rows]
+
+    def _execute_country_batches(
+        self, metrics: List[Dict[str, Any]], scoped: Dict[str, pd.DataFrame]
+    ) -> Dict[str, Any]:
+        """
+        Metrics on one dataset that differ only by a `country == X` filter
+        (country-vs-country comparisons) share a single groupby instead of
+        each filtering the table. Anything else is left to the per-metric path.
+        """
+        buckets: Dict[str, List[Dict[str, Any]]] = {}
+        for m in metrics:
+            df = scoped.get(m.get("dataset"))
+            filters = m.get("filters", [])
+            if (
+                df is None
+                or len(filters) != 1
+                or filters[0].get("column") != "country"
+                or filters[0].get("op") != "=="
+                or not isinstance(filters[0].get("value"), str)
+                or "country" not in df.columns
+                or m.get("column") not in df.columns
+                or m.get("agg") not in AGG_LABELS
+            ):
+                continue
+            buckets.setdefault(m["dataset"], []).append(m)
+
+        results: Dict[str, Any] = {}
+        for dataset, bucket in buckets.items():
+            if len(bucket) < 2:
+                continue
+
+            # one isin pass keeps just the requested countries' rows
+            countries = {m["filters"][0]["value"] for m in bucket}
+            df = scoped[dataset]
+            df = df[df["country"].isin(countries)]
+            numeric = self._numeric_cols.get(dataset, ())
+            aggs: Dict[str, set] = {}
+            for m in bucket:
+                aggs.setdefault(m["column"], {"count"}).add(m["agg"])
+
+            values = pd.DataFrame({
+                col: df[col] if col in numeric else pd.to_numeric(df[col], errors="coerce")
+                for col in aggs
+            })
+            stats = values.groupby(df["country"], observed=True).agg(
+                {col: sorted(col_aggs) for col, col_aggs in aggs.items()}
+            )
+
+            for m in bucket:
+                country = m["filters"][0]["value"]
+                column, agg = m["column"], m["agg"]
+                if country not in stats.index or stats.at[country, (column, "count")] == 0:
+                    results[m["name"]] = {"error": "No data after filtering"}
+                    continue
+                results[m["name"]] = {
+                    "value": float(stats.at[country, (column, agg)]),
+                    "dataset": dataset,
+                    "column": column,
+                    "agg": agg,
+                    "filters": m["filters"],
+                }
+
+        return results
 
     def _execute_plan(self, plan: Dict[str, Any]) -> Dict[str, Any]:
         results: Dict[str, Any] = {}
@@ -401,6 +585,14 @@ Rules:
         time_scope = plan.get("time_scope", {"type": "all"})
         metrics = plan.get("metrics", [])
 
+        # time filter: the scope is shared by every metric, so apply it once per dataset
+        scoped = {
+            dataset: self._apply_time_scope(dataset, self._get_table(dataset), time_scope)
+            for dataset in {m["dataset"] for m in metrics}
+            if dataset in self._paths
+        }
+        batched = self._execute_country_batches(metrics, scoped)
+
         for m in metrics:
             name = m["name"]
             dataset = m["dataset"]
@@ -408,14 +600,16 @@ Rules:
             agg = m["agg"]
             filters = m.get("filters", [])
 
-            if dataset not in self.tables:
+            if dataset not in self._paths:
                 results[name] = {"error": f"Unknown dataset {dataset}"}
                 continue
 
-            df = self.tables[dataset]
+            if name in batched:
+                results[name] = batched[name]
+                continue
+
+            df = scoped[dataset]
 
-            # time filter
-            df = self._apply_time_scope(df, time_scope)
             # value filters
             df = self._apply_filters(df, filters)
 
@@ -424,8 +618,9 @@ Rules:
                 continue
 
             series = df[column]
-            # ensure numeric
-            series = pd.to_numeric(series, errors="coerce")
+            # ensure numeric (already done at load for numeric columns)
+            if column not in self._numeric_cols.get(dataset, ()):
+                series = pd.to_numeric(series, errors="coerce")
             series = series.dropna()
 
             if series.empty:
@@ -455,6 +650,54 @@ Rules:
         return results
 
 
+    def _render_summary_template(self, plan: Dict[str, Any], metric_results: Dict[str, Any]) -> Optional[str]:
+        """
+        Deterministic summary for simple plans (1-2 metrics, no year range,
+        no failed metrics), so they skip the second LLM round trip.
+        Returns None when the plan needs the LLM summarizer.
+        """
+        metrics = plan.get("metrics", [])
+        time_scope = plan.get("time_scope") or {}
+        comparison = plan.get("comparison") or {}
+        ctype = comparison.get("type", "none")
+
+        if not metrics or len(metrics) > 2 or time_scope.get("type", "all") == "range":
+            return None
+        if ctype not in ("none", "which_is_greater"):
+            return None
+        if any("value" not in metric_results.get(m.get("name"), {}) for m in metrics):
+            return None
+
+        if time_scope.get("type") == "year":
+            scope_text = f"in {time_scope.get('year')}"
+        else:
+            scope_text = "over all available years"
+
+        lines = []
+        for m in metrics:
+            res = metric_results[m["name"]]
+            filters = " and ".join(
+                f"{f.get('column')} {f.get('op')} {f.get('value')}" for f in res.get("filters", [])
+            )
+            filter_text = f" where {filters}" if filters else ""
+            lines.append(
+                f"- **{m['name']}**: {AGG_LABELS.get(res['agg'], res['agg'])} of "
+                f"`{res['column']}` in dataset `{res['dataset']}`{filter_text}, "
+                f"{scope_text}: **{res['value']:,.2f}**"
+            )
+
+        if ctype == "which_is_greater":
+            left, right = comparison.get("left_metric"), comparison.get("right_metric")
+            if left in metric_results and right in metric_results:
+                lv, rv = metric_results[left]["value"], metric_results[right]["value"]
+                if lv == rv:
+                    lines.append(f"\n**{left}** and **{right}** are equal.")
+                else:
+                    bigger, smaller = (left, right) if lv > rv else (right, left)
+                    lines.append(f"\n**{bigger}** is greater than **{smaller}**.")
+
+        return "\n".join(lines)
+
     def _summarize(self, question: str, plan: Dict[str, Any], metric_results: Dict[str, Any]) -> str:
         summary_obj = {
             "question": question,
@@ -479,7 +722,7 @@ Rules:
                 },
                 {
                     "role": "user",
-                    "content": json.dumps(summary_obj, indent=2),
+                    "content": json.dumps(summary_obj, separators=(",", ":")),
                 },
             ],
             max_completion_tokens=220,
@@ -487,28 +730,73 @@ Rules:
         )
         return completion.choices[0].message.content.strip()
 
+    # ---------- Semantic answer cache ----------
+
+    def _cached_answer(self, q_emb: np.ndarray, numbers: tuple):
+        """Answer of the most similar previous question, or None on a miss."""
+        if not self._qcache_answers:
+            return None
+        # rows are unit length, so one mat-vec gives every cosine similarity
+        sims = self._qcache_embs @ q_emb
+        best = int(sims.argmax())
+        if sims[best] >= SEMANTIC_CACHE_THRESHOLD and self._qcache_numbers[best] == numbers:
+            return self._qcache_answers[best]
+        return None
+
+    def _remember_answer(self, q_emb: np.ndarray, numbers: tuple, answer_text: str) -> None:
+        if self._qcache_answers:
+            self._qcache_embs = np.vstack([self._qcache_embs, q_emb])
+        else:
+            self._qcache_embs = q_emb[np.newaxis, :]
+        self._qcache_numbers.append(numbers)
+        self._qcache_answers.append(answer_text)
+
+        # bounded FIFO; a linear scan over this many rows is a single small matmul
+        if len(self._qcache_answers) > SEMANTIC_CACHE_SIZE:
+            self._qcache_embs = self._qcache_embs[1:]
+            del self._qcache_numbers[0]
+            del self._qcache_answers[0]
+
     # ---------- Public entrypoint ----------
 
     def answer(self, question: str) -> str:
         """
         Full pipeline:
         question -> plan -> execute -> summarize
+        Paraphrases of an earlier question are answered from the semantic cache.
         """
-        plan = self._plan_query(question)
+        q_emb = self.semantic_index.embed(question)
+        # years/counts must match exactly: "in 2020" vs "in 2022" embed almost identically
+        numbers = tuple(re.findall(r"\d+", question))
+        cached = self._cached_answer(q_emb, numbers)
+        if cached is not None:
+            return cached
+
+        plan = self._plan_query(question, q_emb)
         metric_results = self._execute_plan(plan)
         
         # DEBUG: see what the model actually planned & computed
-        print("\n📌 PLAN:")
-        print(json.dumps(plan, indent=2))
-        print("\n📊 METRIC RESULTS:")
-        print(json.dumps(metric_results, indent=2))
-        
-        answer_text = self._summarize(question, plan, metric_results)
+        if log.isEnabledFor(logging.DEBUG):
+            log.debug("plan=%s results=%s", plan, metric_results)
+
+        # simple plans get a templated summary; the rest go back to the LLM
+        answer_text = self._render_summary_template(plan, metric_results)
+        if answer_text is None:
+            answer_text = self._summarize(question, plan, metric_results)
+        self._remember_answer(q_emb, numbers, answer_text)
         return answer_text
     
+@functools.lru_cache(maxsize=1)
+def get_bot() -> WaterSemanticAssistant:
+    """
+    Build the assistant on first use, so importing this module stays cheap.
+    """
+    return WaterSemanticAssistant(DATASETS)
+
+
 if __name__ == "__main__":
 
-    assistant = WaterSemanticAssistant(DATASETS)
+    assistant = get_bot()
 
     
     test_questions = [
@@ -528,6 +816,3 @@ if __name__ == "__main__":
         except Exception as e:
             print("❌ ERROR:", e)
         print("="*70)
-        
-        
-bot = WaterSemanticAssistant(DATASETS)
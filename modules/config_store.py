@@ -0,0 +1,36 @@
+import copy
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+import yaml
+
+CONFIG_PATH = "config.yaml"
+
+# libyaml's C dumper when available, pure-Python otherwise
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+# One worker: writes run one at a time in the order they were submitted, so
+# an older snapshot can never land after a newer one
+_writer = ThreadPoolExecutor(max_workers=1)
+
+
+@st.cache_resource
+def load_config():
+    """Read config.yaml once per server process; callers share and mutate this dict."""
+    with open(CONFIG_PATH, "r") as file:
+        return yaml.safe_load(file)
+
+
+def _write_config(snapshot):
+    # Write to a temp file and rename over, so readers never see a torn config
+    tmp_path = CONFIG_PATH + ".tmp"
+    with open(tmp_path, "w") as file:
+        yaml.dump(snapshot, file, Dumper=_Dumper, default_flow_style=False)
+    os.replace(tmp_path, CONFIG_PATH)
+
+
+def save_config(config):
+    """Persist the in-memory config on the background writer so the UI doesn't block."""
+    # Snapshot first so later in-memory edits can't race the dump
+    snapshot = copy.deepcopy(config)
+    _writer.submit(_write_config, snapshot)
@@ -1,74 +1,422 @@
+import os
 import streamlit as st
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.csv as pacsv
+import pyarrow.parquet as pq
 import plotly.express as px
 from components.container import card_container
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 
-@st.cache_data
-def load_data():
-    df_billing = pd.read_csv('data/billing.csv', low_memory=False)
-    df_billing = df_billing[df_billing['date'] != 'date'].reset_index(drop=True)
-    df_billing['date'] = pd.to_datetime(df_billing['date'], format='%Y-%m-%d')
-    
-    # Convert numeric columns from strings to numbers
-    df_billing['consumption_m3'] = pd.to_numeric(df_billing['consumption_m3'], errors='coerce')
-    df_billing['billed'] = pd.to_numeric(df_billing['billed'], errors='coerce')
-    df_billing['paid'] = pd.to_numeric(df_billing['paid'], errors='coerce')
+# Every billing.csv column: the charts read the first six, and the raw-data
+# expander shows zone and source too
+BILLING_COLUMNS = ['customer_id', 'date', 'consumption_m3', 'billed', 'paid', 'country',
+                   'zone', 'source']
+# Bump whenever _parse_billing_csv changes what it writes, so a Parquet copy
+# left behind by an older parse is rebuilt rather than reused
+BILLING_PARSE_VERSION = 2
+
+# Dark styling shared by every chart on this page, built once; each figure's
+# update_layout only adds its own height, axis formats and extras
+_TEXT = dict(color='#f8f8f2')
+DARK_LAYOUT = dict(plot_bgcolor='rgba(0,0,0,0)', paper_bgcolor='rgba(0,0,0,0)',
+                   font=_TEXT, title_font=_TEXT)
+AXIS_TEXT = dict(color='#f8f8f2', title_font=_TEXT)
+GRID = dict(showgrid=True, gridcolor='rgba(128,128,128,0.2)')
+# complete axis styles for axes with no per-figure extras
+GRID_AXIS = dict(**GRID, **AXIS_TEXT)
+PLAIN_AXIS = dict(showgrid=False, **AXIS_TEXT)
+TOP_LEGEND = dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1, font=_TEXT)
+RATE_COLORBAR = dict(title=dict(text="Rate (%)", font=_TEXT), tickfont=_TEXT)
+
+# Reference lines as plain layout shapes + labels, built once here instead of
+# going through add_hline/add_vline (and their axis introspection) per render.
+# Horizontal lines span the x domain; vertical ones the y domain.
+
+# Billed vs Paid: 85% target on the secondary (collection rate) axis
+RATE_TARGET_LINE = dict(type='line', xref='x domain', x0=0, x1=1, yref='y2', y0=85, y1=85,
+                        line=dict(color='rgba(0,255,0,0.5)', dash='dash'))
+RATE_TARGET_LABEL = dict(text='Target: 85%', showarrow=False, font=_TEXT,
+                         xref='x domain', x=0, xanchor='left', yref='y2', y=85, yanchor='bottom')
+
+# Collection Rate by Country: vertical 85% target
+COLLECTION_TARGET_LINE = dict(type='line', xref='x', x0=85, x1=85, yref='y domain', y0=0, y1=1,
+                              line=dict(color='rgba(255,255,255,0.5)', dash='dash'))
+COLLECTION_TARGET_LABEL = dict(text='Target: 85%', showarrow=False, font=_TEXT,
+                               xref='x', x=85, xanchor='left', yref='y domain', y=1, yanchor='top')
+
+# Customer payment behaviour scatter: 85% payment-rate target
+PAYMENT_TARGET_LINE = dict(type='line', xref='x domain', x0=0, x1=1, yref='y', y0=85, y1=85,
+                           line=dict(color='rgba(255,255,255,0.3)', dash='dash'))
+PAYMENT_TARGET_LABEL = dict(text='Target: 85%', showarrow=False, font=_TEXT,
+                            xref='x domain', x=1, xanchor='right', yref='y', y=85, yanchor='bottom')
+
+# Cost recovery by city: 100% break-even
+BREAK_EVEN_LINE = dict(type='line', xref='x', x0=100, x1=100, yref='y domain', y0=0, y1=1,
+                       line=dict(color='rgba(255,255,255,0.5)', dash='dash'))
+BREAK_EVEN_LABEL = dict(text='Break-even: 100%', showarrow=False, font=_TEXT,
+                        xref='x', x=100, xanchor='left', yref='y domain', y=1, yanchor='top')
+
+
+def _parse_billing_csv(csv_path):
+    # Stream the file through Arrow's CSV reader in blocks, typed at parse
+    # time. The file repeats its header row
+    # in places; listing each header as a null value turns those rows into
+    # nulls (instead of forcing every column to strings), and each block
+    # drops them before it is kept, so the raw file is never held whole.
+    reader = pacsv.open_csv(
+        csv_path,
+        read_options=pacsv.ReadOptions(block_size=16 << 20),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=BILLING_COLUMNS,
+            column_types={'customer_id': pa.string(), 'country': pa.string(),
+                          'zone': pa.string(), 'source': pa.string(),
+                          'consumption_m3': pa.float64(), 'billed': pa.float64(),
+                          'paid': pa.float64(), 'date': pa.timestamp('ns')},
+            null_values=[''] + BILLING_COLUMNS,
+            strings_can_be_null=True,
+            timestamp_parsers=['%Y-%m-%d'],
+        ),
+    )
+    table = pa.Table.from_batches(
+        [batch.filter(pc.is_valid(batch['date'])) for batch in reader],
+        schema=reader.schema,
+    )
     
     # Normalize country names to title case
-    if 'country' in df_billing.columns:
-        df_billing['country'] = df_billing['country'].str.title()
+    table = table.set_column(
+        table.schema.get_field_index('country'), 'country', pc.utf8_title(table['country'])
+    )
+    df_billing = table.to_pandas()
+    # A handful of countries: categorical codes make isin/groupby cheap
+    df_billing['country'] = df_billing['country'].astype('category')
+    # zone and source are only displayed, but as categoricals they are stored once
+    df_billing['zone'] = df_billing['zone'].astype('category')
+    df_billing['source'] = df_billing['source'].astype('category')
+    
+    return df_billing
+
+
+def _parquet_version(parquet_path):
+    """The parse version stamped into a Parquet copy; '' if unstamped or unreadable."""
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+    except (OSError, pa.ArrowInvalid):
+        return ''
+    return metadata.get(b'parse_version', b'').decode()
+
+
+def _read_via_parquet(csv_path, parse, columns, version):
+    """
+    Read a cleaned, typed Parquet copy of csv_path, rebuilding it with parse()
+    whenever it is missing, older than the CSV, or written by a different
+    parse version.
+    """
+    parquet_path = os.path.splitext(csv_path)[0] + '.parquet'
+    if (os.path.exists(parquet_path)
+            and os.path.getmtime(parquet_path) >= os.path.getmtime(csv_path)
+            and _parquet_version(parquet_path) == str(version)):
+        return pd.read_parquet(parquet_path, columns=columns)
     
-    df_financial = pd.read_csv('data/all_fin_service.csv')
-    df_financial['date_MMYY'] = pd.to_datetime(df_financial['date_MMYY'], format='%b/%y')
+    df = parse(csv_path)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # keep the pandas metadata (dtypes such as category) alongside the stamp
+    table = table.replace_schema_metadata(
+        {**(table.schema.metadata or {}), b'parse_version': str(version).encode()}
+    )
+    try:
+        pq.write_table(table, parquet_path, compression='zstd')
+    except OSError:
+        pass  # read-only deployment: keep using the freshly parsed frame
+    return df[columns]
+
+
+def _country_mask(countries, selected):
+    """Rows of a categorical country column that are in selected, matched on category codes."""
+    wanted = countries.cat.categories.get_indexer(selected)
+    return np.isin(countries.cat.codes.to_numpy(), wanted[wanted >= 0])
+
+
+def _lttb_indices(x, y, n_out):
+    """
+    Largest-Triangle-Three-Buckets: positions of n_out points (x sorted
+    ascending) that keep the visual shape of y against x. The first and
+    last points are always kept.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    idx = np.empty(n_out, dtype=np.int64)
+    idx[0], idx[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # third vertex: mean of the next bucket (the last point for the final one)
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        idx[i + 1] = a
+    return idx
+
+
+# cache_resource: every session shares the same two frames instead of
+# unpickling a fresh copy of 720k billing rows on each rerun. Treat them as
+# read-only; show() filters into new frames.
+@st.cache_resource
+def load_data():
+    # billing.csv is large and all strings; parse it once, then read typed Parquet
+    df_billing = _read_via_parquet(
+        'data/billing.csv', _parse_billing_csv, BILLING_COLUMNS, BILLING_PARSE_VERSION
+    )
+    
+    # dates parsed by the reader itself rather than a second to_datetime pass
+    df_financial = pd.read_csv(
+        'data/all_fin_service.csv',
+        parse_dates=['date_MMYY'],
+        date_format='%b/%y',
+    )
     
     # Normalize country names in financial data too
     if 'country' in df_financial.columns:
-        df_financial['country'] = df_financial['country'].str.title()
+        df_financial['country'] = df_financial['country'].str.title().astype('category')
+    # Few cities, grouped on every render: hash int codes, not strings
+    if 'city' in df_financial.columns:
+        df_financial['city'] = df_financial['city'].astype('category')
+    
+    # Consumption is only averaged for the scatter, so float32 is plenty.
+    # billed/paid stay float64: their totals reach ~2e10, where float32
+    # steps are ~$2k and the to-the-dollar KPIs would drift.
+    df_billing['consumption_m3'] = df_billing['consumption_m3'].astype('float32')
+    
+    # ~5k distinct customers over 720k rows: integer codes let the
+    # per-customer groupby and de-duplication skip hashing strings
+    df_billing['customer_id'] = df_billing['customer_id'].astype('category')
+    
+    # Calendar year extracted once for the year-range filter (not shown in the raw views)
+    df_billing['year'] = df_billing['date'].dt.year.astype('int16')
+    df_financial['year'] = df_financial['date_MMYY'].dt.year.astype('int16')
     
     return df_billing, df_financial
 
 
+@st.cache_data
+def monthly_billing_table():
+    """Billed and paid totals per (month, country) over the whole billing history."""
+    df_billing, _ = load_data()
+    return df_billing.groupby(
+        [pd.Grouper(key='date', freq='MS'), 'country'],
+        observed=True
+    )[['billed', 'paid']].sum().reset_index()
+
+
+def _filter_mask(df, selected_countries, year_range):
+    """Boolean mask over one of the cached frames: selected countries AND year range."""
+    mask = np.ones(len(df), dtype=bool)
+    if selected_countries and 'country' in df.columns:
+        mask &= _country_mask(df['country'], selected_countries)
+    if year_range:
+        start_year, end_year = year_range
+        year = df['year'].to_numpy()
+        mask &= (year >= start_year) & (year <= end_year)
+    return mask
+
+
+@st.cache_data(ttl=3600)
+def billing_panels(countries_key, year_range):
+    """
+    Everything show() needs from the row-level billing data for one filter
+    selection: KPI totals, distinct customers (overall and per country) and
+    the per-customer table. Only these small results are cached, not the
+    filtered rows; countries_key is a sorted tuple so equal selections match.
+    """
+    df_billing, _ = load_data()
+    mask = _filter_mask(df_billing, countries_key, year_range)
+    filtered_billing = df_billing if mask.all() else df_billing[mask]
+    
+    # one column-wise nansum for both totals
+    total_revenue, total_billed = np.nansum(filtered_billing[['paid', 'billed']].to_numpy(), axis=0)
+    
+    # One hash pass for distinct (country, customer) pairs; both the total
+    # and the per-country customer counts come from this much smaller frame
+    country_customers = filtered_billing[['country', 'customer_id']].drop_duplicates()
+    
+    customer_analysis = filtered_billing.groupby('customer_id', observed=True).agg({
+        'consumption_m3': 'mean',
+        'billed': 'sum',
+        'paid': 'sum'
+    }).reset_index()
+    
+    customer_analysis['payment_rate'] = (
+        customer_analysis['paid'] / customer_analysis['billed'] * 100
+    ).clip(0, 100)
+    
+    return {
+        'total_revenue': total_revenue,
+        'total_billed': total_billed,
+        'total_customers': country_customers['customer_id'].nunique(),
+        'customers_by_country': country_customers.groupby('country', observed=True).size(),
+        'customer_analysis': customer_analysis,
+    }
+
+
+def _safe_ratio(num, den):
+    """num / den elementwise; NaN where den is zero, so those rows drop out of
+    the ranking and averages instead of surfacing as inf."""
+    return np.divide(num, den, out=np.full_like(num, np.nan), where=den != 0)
+
+
+# Financial columns summed per city for the unit cost view
+UNIT_COST_COLUMNS = ['opex', 'sewer_billed', 'sewer_length', 'san_staff', 'w_staff', 'sewer_revenue']
+
+
+@st.cache_data(ttl=3600)
+def unit_cost_table(df):
+    """Per-city cost totals and unit ratios; df holds 'city' plus UNIT_COST_COLUMNS."""
+    # every column is a plain sum: one groupby-sum over the projected block,
+    # unsorted since the view re-sorts by opex per customer
+    unit_costs = df.groupby('city', sort=False, observed=True)[UNIT_COST_COLUMNS].sum().reset_index()
+
+    # Only shown as whole dollars and bars: float32 totals are plenty and
+    # halve what the ratio pass and the chart payload move around
+    unit_costs[UNIT_COST_COLUMNS] = unit_costs[UNIT_COST_COLUMNS].astype('float32')
+
+    # Ratios on the raw arrays (no per-op Series alignment)
+    c = {col: unit_costs[col].to_numpy() for col in UNIT_COST_COLUMNS}
+    unit_costs['opex_per_customer'] = _safe_ratio(c['opex'], c['sewer_billed'])
+    unit_costs['opex_per_km'] = _safe_ratio(c['opex'], c['sewer_length'])
+    unit_costs['revenue_per_staff'] = _safe_ratio(c['sewer_revenue'], c['san_staff'] + c['w_staff'])
+    return unit_costs
+
+
+# Complete, validated layouts for the two Section 5 figures, built once at
+# import; go.Figure(layout=...) copies them instead of re-validating a
+# layout dict on every build
+OPEX_TREND_LAYOUT = go.Layout(
+    title='Revenue vs Operating Expenses Over Time',
+    height=450,
+    hovermode='x unified',
+    **DARK_LAYOUT,
+    # axis titles inside the axis dicts: a bare xaxis_title here would
+    # replace the title object and drop its font
+    xaxis=dict(title_text='Month', **GRID_AXIS),
+    yaxis=dict(
+        title_text='Amount ($)',
+        **GRID,
+        tickprefix='$', 
+        tickformat=',.0f',
+        **AXIS_TEXT
+    ),
+    legend=TOP_LEGEND
+)
+
+UNIT_COST_LAYOUT = go.Layout(
+    title='Operating Cost per Customer by City (Top 15)',
+    height=450,
+    **DARK_LAYOUT,
+    xaxis=dict(
+        title_text='City',
+        showgrid=False, 
+        tickangle=-45,
+        **AXIS_TEXT
+    ),
+    yaxis=dict(
+        title_text='Opex per Customer ($)',
+        **GRID,
+        tickprefix='$', 
+        tickformat=',.0f',
+        **AXIS_TEXT
+    )
+)
+
+
+# Built figures are kept as live objects: st.plotly_chart re-validates a
+# plain spec dict from scratch, which costs more than building the figure
+@st.cache_resource(max_entries=64)
+def opex_trend_figure(months, revenue, opex):
+    """
+    Revenue vs opex line chart; arguments are equal-length tuples (hashable
+    cache keys), handed to the traces as arrays for the ndarray encode path.
+    """
+    fig = go.Figure(layout=OPEX_TREND_LAYOUT)
+
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=np.asarray(revenue),
+        name='Revenue',
+        mode='lines+markers',
+        line=dict(color='#6bcf7f', width=3),
+        marker=dict(size=6)
+    ))
+
+    fig.add_trace(go.Scatter(
+        x=months,
+        y=np.asarray(opex),
+        name='Opex',
+        mode='lines+markers',
+        line=dict(color='#ff6b6b', width=3),
+        marker=dict(size=6)
+    ))
+    return fig
+
+
+@st.cache_resource(max_entries=64)
+def unit_cost_figure(cities, opex_per_customer):
+    """Opex per customer bar chart for the cheapest cities."""
+    fig = go.Figure(layout=UNIT_COST_LAYOUT)
+
+    fig.add_trace(go.Bar(
+        x=np.asarray(cities),
+        y=np.asarray(opex_per_customer, dtype=np.float32),
+        name='Opex/Customer',
+        marker_color='#5681d0'
+    ))
+    return fig
+
+
 def show(selected_countries, year_range=None):
     st.title("Financial Performance")
     
     df_billing, df_financial = load_data()
     
-    # Apply filters to both datasets
-    filtered_billing = df_billing.copy()
-    filtered_financial = df_financial.copy()
+    # Row-level billing work for this filter selection, cached per selection
+    panels = billing_panels(
+        tuple(sorted(selected_countries or ())),
+        tuple(year_range) if year_range else None
+    )
     
-    # Filter by selected countries from global filter
-    if selected_countries:
-        filtered_billing = filtered_billing[filtered_billing['country'].isin(selected_countries)]
-        if 'country' in filtered_financial.columns:
-            filtered_financial = filtered_financial[filtered_financial['country'].isin(selected_countries)]
+    # The financial frame is small; filter it here with the same mask rules
+    financial_mask = _filter_mask(df_financial, selected_countries, year_range)
+    filtered_financial = df_financial if financial_mask.all() else df_financial[financial_mask]
     
-    # Filter by year range from global filter
-    if year_range:
-        start_year, end_year = year_range
-        filtered_billing = filtered_billing[
-            (filtered_billing['date'].dt.year >= start_year) & 
-            (filtered_billing['date'].dt.year <= end_year)
-        ]
-        filtered_financial = filtered_financial[
-            (filtered_financial['date_MMYY'].dt.year >= start_year) & 
-            (filtered_financial['date_MMYY'].dt.year <= end_year)
-        ]
-
-    # Calculate KPIs using FILTERED data
-    total_revenue = filtered_billing['paid'].sum()
-    total_billed = filtered_billing['billed'].sum()
+    # Drop the filtered-out country categories too, or Plotly's color
+    # grouping trips over the empty ones
+    if selected_countries and 'country' in filtered_financial.columns:
+        filtered_financial = filtered_financial.assign(
+            country=lambda d: d['country'].cat.remove_unused_categories()
+        )
+
+    # KPIs from the cached billing totals and the filtered financial data
+    total_revenue = panels['total_revenue']
+    total_billed = panels['total_billed']
     collection_rate = (total_revenue / total_billed * 100) if total_billed > 0 else 0
     
-    total_sewer_revenue = filtered_financial['sewer_revenue'].sum() if len(filtered_financial) > 0 else 0
-    total_opex = filtered_financial['opex'].sum() if len(filtered_financial) > 0 else 0
+    total_sewer_revenue, total_opex = np.nansum(
+        filtered_financial[['sewer_revenue', 'opex']].to_numpy(), axis=0
+    )
     cost_recovery_rate = (total_sewer_revenue / total_opex * 100) if total_opex > 0 else 0
     
     outstanding = total_billed - total_revenue
-    total_customers = filtered_billing['customer_id'].nunique()
+    total_customers = panels['total_customers']
     avg_revenue_per_customer = (total_revenue / total_customers) if total_customers > 0 else 0
 
     # KPIs Display
@@ -101,74 +449,94 @@ def show(selected_countries, year_range=None):
             st.metric("Avg Revenue/Customer", f"${avg_revenue_per_customer:,.0f}")
 
 
+    # Month x country billing totals, sliced from the cached full-history
+    # table; the monthly and per-country charts below all derive from it
+    monthly_country = monthly_billing_table()
+    keep = pd.Series(True, index=monthly_country.index)
+    if selected_countries:
+        keep &= monthly_country['country'].isin(selected_countries)
+    if year_range:
+        keep &= monthly_country['date'].dt.year.between(*year_range)
+    monthly_country = monthly_country[keep].assign(
+        country=lambda d: d['country'].cat.remove_unused_categories()
+    )
+    # Per-country totals and collection rate, shared by the revenue
+    # breakdown (sorted by paid) and collection (sorted by rate) views
+    country_totals = monthly_country.groupby('country', observed=True)[['paid', 'billed']].sum()
+    country_totals['collection_rate'] = country_totals['paid'] / country_totals['billed'] * 100
+
     # SECTION 1: Revenue Breakdown & Trends
     st.markdown("### Revenue Breakdown & Trends")
 
-    tab1, tab2 = st.tabs(["Monthly Revenue", "Revenue Breakdown"])
+    # Each section has a view switcher instead of st.tabs: tabs run every
+    # body on each rerun, whereas only the selected view is computed here
+
+    active = st.radio(
+        "View",
+        ["Monthly Revenue", "Revenue Breakdown"],
+        horizontal=True,
+        key="active_revenue_tab",
+        label_visibility="collapsed"
+    )
 
-    with tab1:
+    if active == "Monthly Revenue":
         # Monthly revenue trend by country
-        monthly_by_country = filtered_billing.groupby(
-            [pd.Grouper(key='date', freq='MS'), 'country'], 
-            dropna=False
-        ).agg({'paid': 'sum'}).reset_index()
-        
-        monthly_by_country = monthly_by_country.dropna(subset=['country'])
-
-        fig_revenue = px.line(
-            monthly_by_country,
-            x='date',
-            y='paid',
-            color='country',
-            title='Monthly Revenue Trend by Country',
-            labels={'date': 'Month', 'paid': 'Revenue ($)', 'country': 'Country'},
-            markers=True
-        )
+        monthly_by_country = monthly_country[['date', 'country', 'paid']]
+
+        if monthly_by_country['country'].nunique() == 1:
+            # Single country: build the one trace directly instead of going
+            # through Plotly Express's per-color grouping
+            country = monthly_by_country['country'].iloc[0]
+            fig_revenue = go.Figure(go.Scattergl(
+                x=monthly_by_country['date'],
+                y=monthly_by_country['paid'],
+                mode='lines+markers',
+                name=country,
+                legendgroup=country,
+                showlegend=True,
+                hovertemplate=f'Country={country}<br>Month=%{{x}}<br>Revenue ($)=%{{y}}<extra></extra>'
+            ))
+            fig_revenue.update_layout(
+                title='Monthly Revenue Trend by Country',
+                xaxis_title='Month',
+                yaxis_title='Revenue ($)',
+                legend_title_text='Country'
+            )
+        else:
+            fig_revenue = px.line(
+                monthly_by_country,
+                x='date',
+                y='paid',
+                color='country',
+                title='Monthly Revenue Trend by Country',
+                labels={'date': 'Month', 'paid': 'Revenue ($)', 'country': 'Country'},
+                markers=True,
+                render_mode='webgl'
+            )
         
         fig_revenue.update_layout(
             height=450,
             hovermode='x unified',
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#f8f8f2'),
-            title_font=dict(color='#f8f8f2'),
-            xaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(128,128,128,0.2)',
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
-            ),
+            **DARK_LAYOUT,
+            xaxis=GRID_AXIS,
             yaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(128,128,128,0.2)', 
+                **GRID,
                 tickprefix='$', 
                 tickformat=',.0f',
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
+                **AXIS_TEXT
             ),
-            legend=dict(
-                orientation="h", 
-                yanchor="bottom", 
-                y=1.02, 
-                xanchor="right", 
-                x=1,
-                font=dict(color='#f8f8f2')
-            )
+            legend=TOP_LEGEND
         )
         
         fig_revenue.update_traces(line=dict(width=2.5), marker=dict(size=6))
         
         st.plotly_chart(fig_revenue, use_container_width=True)
 
-    with tab2:
+    else:
         # Revenue breakdown by country
-        country_revenue = filtered_billing.groupby('country').agg({
-            'paid': 'sum',
-            'billed': 'sum',
-            'customer_id': 'nunique'
-        }).reset_index()
-        
-        country_revenue['collection_rate'] = (country_revenue['paid'] / country_revenue['billed'] * 100)
+        country_revenue = country_totals.assign(
+            customer_id=panels['customers_by_country']
+        )[['paid', 'billed', 'customer_id', 'collection_rate']].reset_index()
         country_revenue = country_revenue.sort_values('paid', ascending=True)
         
         fig = px.bar(
@@ -185,58 +553,69 @@ def show(selected_countries, year_range=None):
             texttemplate='$%{text:,.0f}', 
             textposition='outside',
             marker_color='#5681d0',
-            textfont=dict(color='#f8f8f2')
+            textfont=_TEXT
         )
         
         fig.update_layout(
             height=400,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#f8f8f2'),
-            title_font=dict(color='#f8f8f2'),
+            **DARK_LAYOUT,
             xaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(128,128,128,0.2)', 
+                **GRID,
                 tickprefix='$', 
                 tickformat=',.0f',
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
+                **AXIS_TEXT
             ),
-            yaxis=dict(
-                showgrid=False,
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
-            )
+            yaxis=PLAIN_AXIS
         )
         
         st.plotly_chart(fig, use_container_width=True)
         
         # Display table
         st.markdown("**Country Performance Summary**")
-        country_display = country_revenue.sort_values('paid', ascending=False).copy()
-        country_display['paid'] = country_display['paid'].apply(lambda x: f"${x:,.0f}")
-        country_display['billed'] = country_display['billed'].apply(lambda x: f"${x:,.0f}")
-        country_display['collection_rate'] = country_display['collection_rate'].apply(lambda x: f"{x:.1f}%")
-        country_display.columns = ['Country', 'Revenue', 'Billed', 'Customers', 'Collection Rate']
-        
-        st.dataframe(country_display, hide_index=True, use_container_width=True)
+        # Headers come from column_config (no renamed copy of the frame).
+        # Values stay numeric; the Styler formats them at render time, since
+        # column_config's printf formats can't group thousands
+        st.dataframe(
+            country_revenue.sort_values('paid', ascending=False).style.format({
+                'paid': '${:,.0f}',
+                'billed': '${:,.0f}',
+                'collection_rate': '{:.1f}%'
+            }),
+            hide_index=True,
+            use_container_width=True,
+            column_config={
+                'country': 'Country',
+                'paid': 'Revenue',
+                'billed': 'Billed',
+                'customer_id': 'Customers',
+                'collection_rate': 'Collection Rate'
+            }
+        )
 
     
     # SECTION 2: Collection Efficiency & Payment Analysis
     st.markdown("### Collection Efficiency & Payment Analysis")
 
-    tab1, tab2 = st.tabs(["Billed vs Paid Analysis", "Collection Rate by Country"])
+    active = st.radio(
+        "View",
+        ["Billed vs Paid Analysis", "Collection Rate by Country"],
+        horizontal=True,
+        key="active_collection_tab",
+        label_visibility="collapsed"
+    )
     
-    with tab1:
+    if active == "Billed vs Paid Analysis":
         # Prepare monthly data
+        # monthly_country is already keyed by month start, so there is no
+        # Period conversion or to_timestamp() round-trip per render
         monthly_billing = (
-            filtered_billing
-            .groupby(filtered_billing['date'].dt.to_period('M'))
-            .agg({'billed': 'sum', 'paid': 'sum'})
+            monthly_country
+            .groupby('date')[['billed', 'paid']]
+            .sum()
+            .rename_axis('month')
             .reset_index()
         )
 
-        monthly_billing['month'] = monthly_billing['date'].dt.to_timestamp()
         monthly_billing['collection_rate'] = (
             monthly_billing['paid'] / monthly_billing['billed'] * 100
         )
@@ -270,7 +649,7 @@ def show(selected_countries, year_range=None):
         )
 
         fig.add_trace(
-            go.Scatter(
+            go.Scattergl(
                 x=monthly_billing['month'],
                 y=monthly_billing['collection_rate'],
                 name='Collection Rate',
@@ -281,52 +660,31 @@ def show(selected_countries, year_range=None):
             secondary_y=True
         )
 
-        fig.add_hline(
-            y=85,
-            line_dash="dash",
-            line_color="rgba(0,255,0,0.5)",
-            annotation_text="Target: 85%",
-            annotation_position="top left",
-            annotation_font=dict(color='#f8f8f2'),
-            secondary_y=True
-        )
+        fig.update_layout(shapes=[RATE_TARGET_LINE], annotations=[RATE_TARGET_LABEL])
 
         fig.update_xaxes(
             title_text="Month",
-            color='#f8f8f2',
-            title_font=dict(color='#f8f8f2')
+            **AXIS_TEXT
         )
         fig.update_yaxes(
             title_text="Amount ($)", 
             secondary_y=False,
-            showgrid=True, 
-            gridcolor='rgba(128,128,128,0.2)',
-            color='#f8f8f2',
-            title_font=dict(color='#f8f8f2')
+            **GRID,
+            **AXIS_TEXT
         )
         fig.update_yaxes(
             title_text="Collection Rate (%)", 
             secondary_y=True, 
             range=[0, 110],
             showgrid=False,
-            color='#f8f8f2',
-            title_font=dict(color='#f8f8f2')
+            **AXIS_TEXT
         )
 
         fig.update_layout(
             height=450,
             hovermode='x unified',
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#f8f8f2'),
-            legend=dict(
-                orientation="h", 
-                yanchor="bottom", 
-                y=1.02, 
-                xanchor="right", 
-                x=1,
-                font=dict(color='#f8f8f2')
-            )
+            **DARK_LAYOUT,
+            legend=TOP_LEGEND
         )
 
         st.plotly_chart(fig, use_container_width=True)
@@ -347,17 +705,9 @@ def show(selected_countries, year_range=None):
             with card_container(key="insight2"):
                 st.metric("Current Outstanding", f"${total_outstanding:,.0f}")
 
-    with tab2:
+    else:
         # Collection rate by country
-        country_collection = filtered_billing.groupby('country').agg({
-            'billed': 'sum',
-            'paid': 'sum'
-        }).reset_index()
-        
-        country_collection['collection_rate'] = (
-            country_collection['paid'] / country_collection['billed'] * 100
-        )
-        country_collection = country_collection.sort_values('collection_rate', ascending=True)
+        country_collection = country_totals.reset_index().sort_values('collection_rate', ascending=True)
         
         fig = px.bar(
             country_collection,
@@ -375,40 +725,22 @@ def show(selected_countries, year_range=None):
         fig.update_traces(
             texttemplate='%{text:.1f}%', 
             textposition='outside',
-            textfont=dict(color='#f8f8f2')
+            textfont=_TEXT
         )
         
-        fig.add_vline(
-            x=85, 
-            line_dash="dash", 
-            line_color="rgba(255,255,255,0.5)",
-            annotation_text="Target: 85%",
-            annotation_font=dict(color='#f8f8f2')
-        )
+        fig.update_layout(shapes=[COLLECTION_TARGET_LINE], annotations=[COLLECTION_TARGET_LABEL])
         
         fig.update_layout(
             height=400,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#f8f8f2'),
-            title_font=dict(color='#f8f8f2'),
+            **DARK_LAYOUT,
             xaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(128,128,128,0.2)', 
+                **GRID,
                 range=[0, 110],
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
-            ),
-            yaxis=dict(
-                showgrid=False,
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
+                **AXIS_TEXT
             ),
+            yaxis=PLAIN_AXIS,
             showlegend=False,
-            coloraxis_colorbar=dict(
-                title=dict(text="Rate (%)", font=dict(color='#f8f8f2')),
-                tickfont=dict(color='#f8f8f2')
-            )
+            coloraxis_colorbar=RATE_COLORBAR
         )
         
         st.plotly_chart(fig, use_container_width=True)
@@ -417,22 +749,25 @@ def show(selected_countries, year_range=None):
     # SECTION 3: Customer Segmentation & Behavior
     st.markdown("### Customer Segmentation & Behavior")
 
-    tab1, tab2 = st.tabs(["Consumption vs Payment Matrix", "Customer Value Segmentation"])
+    # Customer-level analysis (both views below read it)
+    customer_analysis = panels['customer_analysis']
 
-    with tab1:
-        # Customer-level analysis
-        customer_analysis = filtered_billing.groupby('customer_id').agg({
-            'consumption_m3': 'mean',
-            'billed': 'sum',
-            'paid': 'sum'
-        }).reset_index()
-        
-        customer_analysis['payment_rate'] = (
-            customer_analysis['paid'] / customer_analysis['billed'] * 100
-        ).clip(0, 100)
-        
-        sample_size = min(2000, len(customer_analysis))
-        customer_sample = customer_analysis.sample(sample_size) if len(customer_analysis) > sample_size else customer_analysis
+    active = st.radio(
+        "View",
+        ["Consumption vs Payment Matrix", "Customer Value Segmentation"],
+        horizontal=True,
+        key="active_segment_tab",
+        label_visibility="collapsed"
+    )
+
+    if active == "Consumption vs Payment Matrix":
+        # LTTB over customers ordered by consumption: keeps the outliers and
+        # the overall shape that a random sample would thin out
+        ordered = customer_analysis.dropna(subset=['consumption_m3', 'payment_rate']).sort_values('consumption_m3')
+        customer_sample = ordered.iloc[_lttb_indices(
+            ordered['consumption_m3'].to_numpy(), ordered['payment_rate'].to_numpy(), 500
+        )]
+        sample_size = len(customer_sample)
         
         fig = px.scatter(
             customer_sample,
@@ -450,60 +785,41 @@ def show(selected_countries, year_range=None):
             hover_data={'billed': ':$,.0f'}
         )
         
-        fig.add_hline(
-            y=85, 
-            line_dash="dash", 
-            line_color="rgba(255,255,255,0.3)",
-            annotation_text="Target: 85%",
-            annotation_font=dict(color='#f8f8f2')
-        )
+        fig.update_layout(shapes=[PAYMENT_TARGET_LINE], annotations=[PAYMENT_TARGET_LABEL])
         
         fig.update_layout(
             height=450,
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            font=dict(color='#f8f8f2'),
-            title_font=dict(color='#f8f8f2'),
-            xaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(128,128,128,0.2)',
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
-            ),
-            yaxis=dict(
-                showgrid=True, 
-                gridcolor='rgba(128,128,128,0.2)',
-                color='#f8f8f2',
-                title_font=dict(color='#f8f8f2')
-            ),
-            coloraxis_colorbar=dict(
-                title=dict(text="Rate (%)", font=dict(color='#f8f8f2')),
-                tickfont=dict(color='#f8f8f2')
-            )
+            **DARK_LAYOUT,
+            xaxis=GRID_AXIS,
+            yaxis=GRID_AXIS,
+            coloraxis_colorbar=RATE_COLORBAR
         )
         
         st.plotly_chart(fig, use_container_width=True)
 
-    with tab2:
-        customer_analysis['segment'] = 'Standard'
-        customer_analysis.loc[
-            (customer_analysis['payment_rate'] >= 90) & (customer_analysis['billed'] > customer_analysis['billed'].median()),
-            'segment'
-        ] = 'Premium'
-        customer_analysis.loc[
-            (customer_analysis['payment_rate'] >= 85) & (customer_analysis['payment_rate'] < 90),
-            'segment'
-        ] = 'Good'
-        customer_analysis.loc[
-            (customer_analysis['payment_rate'] >= 70) & (customer_analysis['payment_rate'] < 85),
-            'segment'
-        ] = 'At Risk'
-        customer_analysis.loc[
-            customer_analysis['payment_rate'] < 70,
-            'segment'
-        ] = 'Problem'
+    else:
+        # One np.select over the raw arrays; anything unmatched
+        # (incl. >= 90% on a below-median bill) stays Standard
+        rate = customer_analysis['payment_rate'].to_numpy()
+        billed = customer_analysis['billed'].to_numpy()
+        segment_order = ['Premium', 'Good', 'Standard', 'At Risk', 'Problem']
+        customer_analysis['segment'] = pd.Categorical(
+            np.select(
+                [
+                    (rate >= 90) & (billed > customer_analysis['billed'].median()),
+                    (rate >= 85) & (rate < 90),
+                    (rate >= 70) & (rate < 85),
+                    rate < 70
+                ],
+                ['Premium', 'Good', 'At Risk', 'Problem'],
+                default='Standard'
+            ),
+            categories=segment_order,
+            ordered=True
+        )
         
-        segment_summary = customer_analysis.groupby('segment').agg({
+        # grouping on the ordered categorical already yields segment order
+        segment_summary = customer_analysis.groupby('segment', observed=True).agg({
             'customer_id': 'count',
             'paid': 'sum',
             'payment_rate': 'mean'
@@ -512,10 +828,6 @@ def show(selected_countries, year_range=None):
         segment_summary.columns = ['Segment', 'Customer Count', 'Total Revenue', 'Avg Payment Rate']
         segment_summary['Revenue %'] = (segment_summary['Total Revenue'] / segment_summary['Total Revenue'].sum() * 100)
         
-        segment_order = ['Premium', 'Good', 'Standard', 'At Risk', 'Problem']
-        segment_summary['Segment'] = pd.Categorical(segment_summary['Segment'], categories=segment_order, ordered=True)
-        segment_summary = segment_summary.sort_values('Segment')
-        
         col1, col2 = st.columns(2)
         
         with col1:
@@ -536,11 +848,8 @@ def show(selected_countries, year_range=None):
             
             fig.update_layout(
                 height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#f8f8f2'),
-                title_font=dict(color='#f8f8f2'),
-                legend=dict(font=dict(color='#f8f8f2'))
+                **DARK_LAYOUT,
+                legend=dict(font=_TEXT)
             )
             
             fig.update_traces(textfont=dict(color='#ffffff'))
@@ -567,27 +876,18 @@ def show(selected_countries, year_range=None):
             fig.update_traces(
                 texttemplate='$%{text:,.0f}', 
                 textposition='outside',
-                textfont=dict(color='#f8f8f2')
+                textfont=_TEXT
             )
             
             fig.update_layout(
                 height=400,
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#f8f8f2'),
-                title_font=dict(color='#f8f8f2'),
-                xaxis=dict(
-                    showgrid=False,
-                    color='#f8f8f2',
-                    title_font=dict(color='#f8f8f2')
-                ),
+                **DARK_LAYOUT,
+                xaxis=PLAIN_AXIS,
                 yaxis=dict(
-                    showgrid=True, 
-                    gridcolor='rgba(128,128,128,0.2)', 
+                    **GRID,
                     tickprefix='$', 
                     tickformat=',.0f',
-                    color='#f8f8f2',
-                    title_font=dict(color='#f8f8f2')
+                    **AXIS_TEXT
                 ),
                 showlegend=False
             )
@@ -595,28 +895,42 @@ def show(selected_countries, year_range=None):
             st.plotly_chart(fig, use_container_width=True)
         
         st.markdown("**Segment Performance Summary**")
-        display_segment = segment_summary.copy()
-        display_segment['Total Revenue'] = display_segment['Total Revenue'].apply(lambda x: f"${x:,.0f}")
-        display_segment['Avg Payment Rate'] = display_segment['Avg Payment Rate'].apply(lambda x: f"{x:.1f}%")
-        display_segment['Revenue %'] = display_segment['Revenue %'].apply(lambda x: f"{x:.1f}%")
-        
-        st.dataframe(display_segment, hide_index=True, use_container_width=True)
+        st.dataframe(
+            segment_summary.style.format({
+                'Total Revenue': '${:,.0f}',
+                'Avg Payment Rate': '{:.1f}%',
+                'Revenue %': '{:.1f}%'
+            }),
+            hide_index=True,
+            use_container_width=True
+        )
 
 
     # SECTION 4: Sewer Service & Financial Performance
     st.markdown("### Sewer Service & Financial Performance")
 
     if len(filtered_financial) > 0:
-        tab1, tab2 = st.tabs(["Cost Recovery by City", "Revenue vs Opex Efficiency"])
+        # One (city, country) aggregation feeds both tabs
+        if 'city' in filtered_financial.columns:
+            city_totals = (
+                filtered_financial[['city', 'country', 'sewer_revenue', 'opex', 'sewer_billed']]
+                .groupby(['city', 'country'], observed=True)
+                .sum()
+                .reset_index()
+            )
         
-        with tab1:
+        active = st.radio(
+            "View",
+            ["Cost Recovery by City", "Revenue vs Opex Efficiency"],
+            horizontal=True,
+            key="active_sewer_tab",
+            label_visibility="collapsed"
+        )
+        
+        if active == "Cost Recovery by City":
             # Cost recovery by city
             if 'city' in filtered_financial.columns:
-                city_financial = filtered_financial.groupby(['city', 'country']).agg({
-                    'sewer_revenue': 'sum',
-                    'opex': 'sum'
-                }).reset_index()
-                
+                city_financial = city_totals[['city', 'country', 'sewer_revenue', 'opex']].copy()
                 city_financial['cost_recovery'] = (
                     city_financial['sewer_revenue'] / city_financial['opex'] * 100
                 )
@@ -636,56 +950,27 @@ def show(selected_countries, year_range=None):
                 fig.update_traces(
                     texttemplate='%{text:.1f}%', 
                     textposition='outside',
-                    textfont=dict(color='#f8f8f2')
+                    textfont=_TEXT
                 )
                 
-                fig.add_vline(
-                    x=100, 
-                    line_dash="dash", 
-                    line_color="rgba(255,255,255,0.5)",
-                    annotation_text="Break-even: 100%",
-                    annotation_font=dict(color='#f8f8f2')
-                )
+                fig.update_layout(shapes=[BREAK_EVEN_LINE], annotations=[BREAK_EVEN_LABEL])
                 
                 fig.update_layout(
                     height=600,
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#f8f8f2'),
-                    title_font=dict(color='#f8f8f2'),
-                    xaxis=dict(
-                        showgrid=True, 
-                        gridcolor='rgba(128,128,128,0.2)',
-                        color='#f8f8f2',
-                        title_font=dict(color='#f8f8f2')
-                    ),
-                    yaxis=dict(
-                        showgrid=False,
-                        color='#f8f8f2',
-                        title_font=dict(color='#f8f8f2')
-                    ),
-                    legend=dict(
-                        orientation="h", 
-                        yanchor="bottom", 
-                        y=1.02, 
-                        xanchor="right", 
-                        x=1,
-                        font=dict(color='#f8f8f2')
-                    )
+                    **DARK_LAYOUT,
+                    xaxis=GRID_AXIS,
+                    yaxis=PLAIN_AXIS,
+                    legend=TOP_LEGEND
                 )
                 
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("City-level data not available in financial dataset")
 
-        with tab2:
+        else:
             # Revenue vs Opex scatter
             if 'city' in filtered_financial.columns:
-                city_efficiency = filtered_financial.groupby(['city', 'country']).agg({
-                    'sewer_revenue': 'sum',
-                    'opex': 'sum',
-                    'sewer_billed': 'sum'
-                }).reset_index()
+                city_efficiency = city_totals
                 
                 fig = px.scatter(
                     city_efficiency,
@@ -714,27 +999,20 @@ def show(selected_countries, year_range=None):
                 
                 fig.update_layout(
                     height=450,
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#f8f8f2'),
-                    title_font=dict(color='#f8f8f2'),
+                    **DARK_LAYOUT,
                     xaxis=dict(
-                        showgrid=True, 
-                        gridcolor='rgba(128,128,128,0.2)', 
+                        **GRID,
                         tickprefix='$', 
                         tickformat=',.0f',
-                        color='#f8f8f2',
-                        title_font=dict(color='#f8f8f2')
+                        **AXIS_TEXT
                     ),
                     yaxis=dict(
-                        showgrid=True, 
-                        gridcolor='rgba(128,128,128,0.2)', 
+                        **GRID,
                         tickprefix='$', 
                         tickformat=',.0f',
-                        color='#f8f8f2',
-                        title_font=dict(color='#f8f8f2')
+                        **AXIS_TEXT
                     ),
-                    legend=dict(font=dict(color='#f8f8f2'))
+                    legend=dict(font=_TEXT)
                 )
                 
                 st.plotly_chart(fig, use_container_width=True)
@@ -748,144 +1026,65 @@ def show(selected_countries, year_range=None):
     st.markdown("### Operational Cost Analysis")
 
     if len(filtered_financial) > 0:
-        tab1, tab2 = st.tabs(["Opex Trends", "Unit Cost Analysis"])
+        active = st.radio(
+            "View",
+            ["Opex Trends", "Unit Cost Analysis"],
+            horizontal=True,
+            key="active_opex_tab",
+            label_visibility="collapsed"
+        )
         
-        with tab1:
+        if active == "Opex Trends":
             # Opex over time
-            monthly_opex = filtered_financial.groupby('date_MMYY').agg({
-                'opex': 'sum',
-                'sewer_revenue': 'sum'
-            }).reset_index()
+            monthly_opex = (
+                filtered_financial[['date_MMYY', 'opex', 'sewer_revenue']]
+                .groupby('date_MMYY')
+                .sum()
+                .reset_index()
+            )
             
             monthly_opex['net_income'] = monthly_opex['sewer_revenue'] - monthly_opex['opex']
             
-            fig = go.Figure()
-            
-            fig.add_trace(go.Scatter(
-                x=monthly_opex['date_MMYY'],
-                y=monthly_opex['sewer_revenue'],
-                name='Revenue',
-                mode='lines+markers',
-                line=dict(color='#6bcf7f', width=3),
-                marker=dict(size=6)
-            ))
-            
-            fig.add_trace(go.Scatter(
-                x=monthly_opex['date_MMYY'],
-                y=monthly_opex['opex'],
-                name='Opex',
-                mode='lines+markers',
-                line=dict(color='#ff6b6b', width=3),
-                marker=dict(size=6)
-            ))
-            
-            fig.update_layout(
-                title='Revenue vs Operating Expenses Over Time',
-                xaxis_title='Month',
-                yaxis_title='Amount ($)',
-                height=450,
-                hovermode='x unified',
-                plot_bgcolor='rgba(0,0,0,0)',
-                paper_bgcolor='rgba(0,0,0,0)',
-                font=dict(color='#f8f8f2'), 
-                title_font=dict(color='#f8f8f2'),  
-                xaxis=dict(
-                    showgrid=True, 
-                    gridcolor='rgba(128,128,128,0.2)',
-                    color='#f8f8f2',  
-                    title_font=dict(color='#f8f8f2')  
-                ),
-                yaxis=dict(
-                    showgrid=True, 
-                    gridcolor='rgba(128,128,128,0.2)', 
-                    tickprefix='$', 
-                    tickformat=',.0f',
-                    color='#f8f8f2',  
-                    title_font=dict(color='#f8f8f2')  
-                ),
-                legend=dict(
-                    orientation="h", 
-                    yanchor="bottom", 
-                    y=1.02, 
-                    xanchor="right", 
-                    x=1,
-                    font=dict(color='#f8f8f2') 
-                )
+            fig = opex_trend_figure(
+                tuple(monthly_opex['date_MMYY']),
+                tuple(monthly_opex['sewer_revenue']),
+                tuple(monthly_opex['opex'])
             )
             
             st.plotly_chart(fig, use_container_width=True)
 
-        with tab2:
+        else:
             # Unit cost analysis
             if 'city' in filtered_financial.columns and 'sewer_length' in filtered_financial.columns:
-                unit_costs = filtered_financial.groupby('city').agg({
-                    'opex': 'sum',
-                    'sewer_billed': 'sum',
-                    'sewer_length': 'sum',
-                    'san_staff': 'sum',
-                    'w_staff': 'sum',
-                    'sewer_revenue': 'sum'
-                }).reset_index()
-                
-                unit_costs['opex_per_customer'] = unit_costs['opex'] / unit_costs['sewer_billed']
-                unit_costs['opex_per_km'] = unit_costs['opex'] / unit_costs['sewer_length']
-                unit_costs['revenue_per_staff'] = unit_costs['sewer_revenue'] / (unit_costs['san_staff'] + unit_costs['w_staff'])
-                
-                # Sort and take top 15
-                unit_costs = unit_costs.sort_values('opex_per_customer', ascending=True).head(15)
+                unit_costs = unit_cost_table(filtered_financial[['city', *UNIT_COST_COLUMNS]])
                 
-                fig = go.Figure()
+                # Top 15 by partial selection (comes back sorted ascending)
+                unit_costs = unit_costs.nsmallest(15, 'opex_per_customer')
                 
-                fig.add_trace(go.Bar(
-                    x=unit_costs['city'],
-                    y=unit_costs['opex_per_customer'],
-                    name='Opex/Customer',
-                    marker_color='#5681d0'
-                ))
-                
-                fig.update_layout(
-                    title='Operating Cost per Customer by City (Top 15)',
-                    xaxis_title='City',
-                    yaxis_title='Opex per Customer ($)',
-                    height=450,
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#f8f8f2'),  
-                    title_font=dict(color='#f8f8f2'), 
-                    xaxis=dict(
-                        showgrid=False, 
-                        tickangle=-45,
-                        color='#f8f8f2',  
-                        title_font=dict(color='#f8f8f2')  
-                    ),
-                    yaxis=dict(
-                        showgrid=True, 
-                        gridcolor='rgba(128,128,128,0.2)', 
-                        tickprefix='$', 
-                        tickformat=',.0f',
-                        color='#f8f8f2', 
-                        title_font=dict(color='#f8f8f2')  
-                    )
+                fig = unit_cost_figure(
+                    tuple(unit_costs['city']),
+                    tuple(unit_costs['opex_per_customer'])
                 )
                 
                 st.plotly_chart(fig, use_container_width=True)
                 
-                # Summary metrics
+                # Summary metrics, all three averages in one reduction
+                means = unit_costs[['opex_per_customer', 'opex_per_km', 'revenue_per_staff']].mean()
                 col1, col2, col3 = st.columns(3)
                 
                 with col1:
                     with card_container(key="unit_cost1"):
-                        avg_opex_customer = unit_costs['opex_per_customer'].mean()
+                        avg_opex_customer = means['opex_per_customer']
                         st.metric("Avg Opex/Customer", f"${avg_opex_customer:,.0f}")
                 
                 with col2:
                     with card_container(key="unit_cost2"):
-                        avg_opex_km = unit_costs['opex_per_km'].mean()
+                        avg_opex_km = means['opex_per_km']
                         st.metric("Avg Opex/km", f"${avg_opex_km:,.0f}")
                 
                 with col3:
                     with card_container(key="unit_cost3"):
-                        avg_revenue_staff = unit_costs['revenue_per_staff'].mean()
+                        avg_revenue_staff = means['revenue_per_staff']
                         st.metric("Avg Revenue/Staff", f"${avg_revenue_staff:,.0f}")
             else:
                 st.info("Detailed cost breakdown not available")
@@ -896,7 +1095,9 @@ def show(selected_countries, year_range=None):
 
     st.markdown("### Access Datasets")
     with st.expander("Click to view billing.csv", expanded=False): 
-        st.dataframe(df_billing, use_container_width=True, hide_index=True)
+        st.dataframe(df_billing, use_container_width=True, hide_index=True,
+                     column_order=[c for c in df_billing.columns if c != 'year'])
 
     with st.expander("Click to view all_fin_service.csv", expanded=False): 
-        st.dataframe(df_financial, use_container_width=True, hide_index=True)
\ No newline at end of file
+        st.dataframe(df_financial, use_container_width=True, hide_index=True,
+                     column_order=[c for c in df_financial.columns if c != 'year'])
\ No newline at end of file
@@ -1,37 +1,532 @@
 # modules/operations_production.py
 
 import streamlit as st
-import altair as alt
+import numpy as np
 import pandas as pd
 from prophet import Prophet
 
 from . import prod_ops_preprocess_data as prep
 
 
+# ---------- CHART SPECS ----------
+# Plain Vega-Lite dicts, built once at import and handed to st.vega_lite_chart
+# with each render's DataFrame. This skips building (and schema-validating)
+# an Altair object graph for every chart on every rerun. Streamlit copies
+# the spec before adding to it, so these are safe to share.
+
+MONTH_X = {
+    "field": "month_start",
+    "type": "temporal",
+    "title": "Month",
+    "axis": {"format": "%b %Y", "labelAngle": -45},
+}
+MONTH_TOOLTIP = {"field": "month_start", "type": "temporal", "title": "Month"}
+
+# Same month axis for the Prophet frames, which call the date column "ds"
+DS_X = {**MONTH_X, "field": "ds"}
+DS_TOOLTIP = {**MONTH_TOOLTIP, "field": "ds"}
+
+# What Altair's .interactive() adds: pan/zoom bound to the x and y scales
+PAN_ZOOM = {
+    "name": "pan_zoom",
+    "select": {"type": "interval", "encodings": ["x", "y"]},
+    "bind": "scales",
+}
+
+ZONE_COLOR = {"field": "zone", "type": "nominal", "title": "Zone"}
+SERIES_TOOLTIP = {"field": "series_label", "type": "nominal"}
+VOLUME_TOOLTIP = {
+    "field": "value",
+    "type": "quantitative",
+    "title": "Volume (m³)",
+    "format": ",.0f",
+}
+
+NRW_OVERVIEW_TOOLTIP = [
+    MONTH_TOOLTIP,
+    {"field": "nrw_pct", "type": "quantitative"},
+    {"field": "production_m3", "type": "quantitative"},
+    {"field": "billed_volume_m3", "type": "quantitative"},
+]
+NRW_OVERVIEW_ENCODING = {
+    "x": MONTH_X,
+    "y": {
+        "field": "nrw_pct",
+        "type": "quantitative",
+        "title": "NRW (%)",
+        "scale": {"zero": False},  # no forced zero, less blank space
+    },
+    "tooltip": NRW_OVERVIEW_TOOLTIP,
+}
+NRW_OVERVIEW_SPEC = {
+    "layer": [
+        {
+            "name": "nrw_line",
+            "mark": {"type": "line"},
+            "encoding": NRW_OVERVIEW_ENCODING,
+        },
+        {
+            "mark": {"type": "circle", "size": 70},
+            "encoding": {
+                **NRW_OVERVIEW_ENCODING,
+                "color": {
+                    # anomaly: red
+                    "condition": {"test": "datum.nrw_anomaly", "value": "#FF4B4B"},
+                    "value": "#4BC0C0",  # normal: teal-ish
+                },
+            },
+        },
+    ],
+    "params": [{**PAN_ZOOM, "views": ["nrw_line"]}],
+}
+
+PROD_CONS_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": MONTH_X,
+        "y": {"field": "value", "type": "quantitative", "title": "Volume (m³)"},
+        "color": {"field": "metric_label", "type": "nominal", "title": "Series"},
+        "tooltip": [
+            MONTH_TOOLTIP,
+            {"field": "metric_label", "type": "nominal"},
+            VOLUME_TOOLTIP,
+        ],
+    },
+    "height": 350,
+}
+
+FORECAST_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": DS_X,
+        "y": {"field": "y", "type": "quantitative", "title": "Billed Volume (m³)"},
+        "color": {"field": "type", "type": "nominal", "title": "Series"},
+        "tooltip": [
+            DS_TOOLTIP,
+            {"field": "type", "type": "nominal"},
+            {**VOLUME_TOOLTIP, "field": "y"},
+        ],
+    },
+    "height": 350,
+}
+
+MODEL_FIT_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": DS_X,
+        "y": {
+            "field": "value",
+            "type": "quantitative",
+            "title": "Billed Volume (m³)",
+            "scale": {"zero": False},
+        },
+        "color": {"field": "series_label", "type": "nominal", "title": "Series"},
+        "tooltip": [DS_TOOLTIP, SERIES_TOOLTIP, VOLUME_TOOLTIP],
+    },
+    "height": 300,
+    "params": [PAN_ZOOM],
+}
+
+MODEL_ERROR_SPEC = {
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": DS_X,
+        "y": {
+            "field": "abs_error",
+            "type": "quantitative",
+            "title": "Absolute difference (m³)",
+            "scale": {"zero": False},
+        },
+        "tooltip": [
+            DS_TOOLTIP,
+            {
+                "field": "abs_error",
+                "type": "quantitative",
+                "title": "Difference between model and actual (m³)",
+                "format": ",.0f",
+            },
+        ],
+    },
+    "height": 200,
+    "params": [PAN_ZOOM],
+}
+
+CONSUMPTION_TREND_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": MONTH_X,
+        "y": {"field": "value", "type": "quantitative", "title": "Billed Volume (m³)"},
+        "color": {"field": "series_label", "type": "nominal", "title": "Series"},
+        "tooltip": [MONTH_TOOLTIP, SERIES_TOOLTIP, VOLUME_TOOLTIP],
+    },
+    "height": 300,
+}
+
+MONTH_ORDER = [
+    "Jan",
+    "Feb",
+    "Mar",
+    "Apr",
+    "May",
+    "Jun",
+    "Jul",
+    "Aug",
+    "Sep",
+    "Oct",
+    "Nov",
+    "Dec",
+]
+
+SEASONAL_SPEC = {
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {
+            "field": "month_name",
+            "type": "nominal",
+            "title": "Month",
+            "sort": MONTH_ORDER,
+        },
+        "y": {
+            "field": "billed_volume_m3",
+            "type": "quantitative",
+            "title": "Avg Billed Volume (m³)",
+        },
+        "tooltip": [
+            {"field": "month_name", "type": "nominal"},
+            {
+                "field": "billed_volume_m3",
+                "type": "quantitative",
+                "title": "Avg Volume (m³)",
+                "format": ",.0f",
+            },
+        ],
+    },
+    "height": 300,
+}
+
+ZONE_VOLUME_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": MONTH_X,
+        "y": {
+            "field": "billed_volume_m3",
+            "type": "quantitative",
+            "title": "Billed Volume (m³)",
+        },
+        "color": ZONE_COLOR,
+        "tooltip": [
+            MONTH_TOOLTIP,
+            {"field": "zone", "type": "nominal"},
+            {"field": "billed_volume_m3", "type": "quantitative"},
+        ],
+    },
+    "height": 350,
+}
+
+ZONE_COLLECTION_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": MONTH_X,
+        "y": {
+            "field": "collection_rate",
+            "type": "quantitative",
+            "title": "Collection Rate",
+            "axis": {"format": "%", "tickCount": 5},
+        },
+        "color": ZONE_COLOR,
+        "tooltip": [
+            MONTH_TOOLTIP,
+            {"field": "zone", "type": "nominal"},
+            {
+                "field": "collection_rate",
+                "type": "quantitative",
+                "title": "Collection Rate",
+                "format": ".1%",
+            },
+            {"field": "billed_amount", "type": "quantitative"},
+            {"field": "paid_amount", "type": "quantitative"},
+        ],
+    },
+    "height": 300,
+}
+
+ZONE_MIX_SPEC = {
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": {"field": "zone", "type": "nominal", "title": "Zone"},
+        "y": {
+            "field": "volume_share",
+            "type": "quantitative",
+            "title": "Share of Billed Volume",
+            "axis": {"format": "%", "tickCount": 5},
+        },
+        "tooltip": [
+            {"field": "zone", "type": "nominal"},
+            {"field": "billed_volume_m3", "type": "quantitative"},
+            {
+                "field": "volume_share",
+                "type": "quantitative",
+                "title": "Share",
+                "format": ".1%",
+            },
+        ],
+    },
+    "height": 350,
+}
+
+SERVICE_HOURS_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": MONTH_X,
+        "y": {
+            "field": "avg_service_hours",
+            "type": "quantitative",
+            "title": "Average service hours per day",
+        },
+        "tooltip": [
+            MONTH_TOOLTIP,
+            {
+                "field": "avg_service_hours",
+                "type": "quantitative",
+                "title": "Hours/day",
+                "format": ".1f",
+            },
+        ],
+    },
+    "height": 350,
+}
+
+HOURS_VS_CONSUMPTION_SPEC = {
+    "mark": {"type": "circle", "size": 80},
+    "encoding": {
+        "x": {
+            "field": "avg_service_hours",
+            "type": "quantitative",
+            "title": "Average service hours per day",
+        },
+        "y": {
+            "field": "billed_volume_m3",
+            "type": "quantitative",
+            "title": "Billed volume (m³)",
+        },
+        "color": {"field": "year", "type": "ordinal", "title": "Year"},
+        "tooltip": [
+            MONTH_TOOLTIP,
+            {"field": "avg_service_hours", "type": "quantitative"},
+            {"field": "billed_volume_m3", "type": "quantitative"},
+            {"field": "year", "type": "ordinal"},
+        ],
+    },
+    "height": 350,
+}
+
+NRW_REVENUE_SPEC = {
+    "mark": {"type": "bar"},
+    "encoding": {
+        "x": MONTH_X,
+        "y": {
+            "field": "nrw_revenue_equiv",
+            "type": "quantitative",
+            "title": "Estimated NRW-related revenue (currency units)",
+        },
+        "tooltip": [
+            MONTH_TOOLTIP,
+            {
+                "field": "nrw_revenue_equiv",
+                "type": "quantitative",
+                "title": "NRW revenue equivalent",
+                "format": ",.0f",
+            },
+            {
+                "field": "nrw_volume_m3",
+                "type": "quantitative",
+                "title": "NRW volume (m³)",
+                "format": ",.0f",
+            },
+            {
+                "field": "implied_tariff",
+                "type": "quantitative",
+                "title": "Implied tariff",
+                "format": ",.2f",
+            },
+        ],
+    },
+    "height": 350,
+}
+
+NRW_PCT_SPEC = {
+    "mark": {"type": "line", "point": True},
+    "encoding": {
+        "x": MONTH_X,
+        "y": {"field": "nrw_pct", "type": "quantitative", "title": "NRW (%)"},
+        "tooltip": [MONTH_TOOLTIP, {"field": "nrw_pct", "type": "quantitative"}],
+    },
+    "height": 250,
+}
+
+
 # ---------- CACHED DATA HELPERS ----------
 
+# Metrics with a latest-month YoY change on the KPI cards
+YOY_COLUMNS = ["nrw_pct", "production_m3", "billed_volume_m3"]
+
 @st.cache_data
 def get_monthly_nrw_country() -> pd.DataFrame:
-    return prep.monthly_nrw_country()
+    df = prep.monthly_nrw_country()
+    # A handful of countries, filtered on every rerun: categorical codes
+    # compare as ints instead of Python strings
+    df["country"] = df["country"].astype("category")
+    return df
 
 
 @st.cache_data
 def get_monthly_billing_country_zone() -> pd.DataFrame:
-    return prep.monthly_billing_by("country_zone")
+    df = prep.monthly_billing_by("country_zone")
+    # Same for the country and zone filters on the zone tabs
+    df["country"] = df["country"].astype("category")
+    df["zone"] = df["zone"].astype("category")
+    return df
+
+
+def rolling_mean(series: pd.Series, window: int) -> np.ndarray:
+    """
+    Trailing `window`-row mean from one cumulative sum, matching
+    series.rolling(window).mean(): NaN until the first full window.
+    """
+    values = series.to_numpy(dtype=float)
+    if np.isnan(values).any():
+        # A running sum would carry a gap into every later window
+        return series.rolling(window).mean().to_numpy()
+
+    out = np.full(len(values), np.nan)
+    if len(values) >= window:
+        csum = np.concatenate(([0.0], np.cumsum(values)))
+        out[window - 1:] = (csum[window:] - csum[:-window]) / window
+    return out
 
 
 @st.cache_data
-def get_consumption_forecast(country: str, periods: int) -> pd.DataFrame:
+def get_country_bundle(country: str) -> dict:
     """
-    Build a simple Prophet model on billed consumption for the given country
-    and forecast the next `periods` months.
+    Everything the page derives per country, computed once per country:
+    country_data (sorted, with rolling averages and NRW anomaly flags),
+    zone_data, the zone mix month picker options (mix_months and their
+    mix_month_labels), and the latest month's YoY changes (nrw_yoy, prod_yoy,
+    cons_yoy; None where there is no usable prior-year value).
     """
-    df_country = prep.monthly_nrw_country()
-    df_country = df_country[df_country["country"] == country].copy()
-    df_country = df_country.sort_values("month_start")
+    df_country = get_monthly_nrw_country()
+    df_zone = get_monthly_billing_country_zone()
+
+    # Filter country-level data
+    # sort_values already returns a new frame, so no defensive copies here
+    country_data = df_country[df_country["country"] == country]
+    country_data = country_data.sort_values("month_start")
+
+    # Filter zone-level data for this country
+    zone_data = df_zone[df_zone["country"] == country]
+    zone_data = zone_data.sort_values("month_start")
+
+    # Month picker options for the zone mix tab
+    mix_months = pd.DatetimeIndex(zone_data["month_start"].unique()).sort_values()
+    mix_month_labels = list(mix_months.strftime("%b %Y"))
+
+    if country_data.empty:
+        return {
+            "country_data": country_data,
+            "zone_data": zone_data,
+            "mix_months": list(mix_months),
+            "mix_month_labels": mix_month_labels,
+            "nrw_yoy": None,
+            "prod_yoy": None,
+            "cons_yoy": None,
+        }
+
+    # Compute rolling averages for trend KPIs
+    country_data["nrw_3m_avg"] = rolling_mean(country_data["nrw_pct"], 3)
+    country_data["production_3m_avg"] = rolling_mean(country_data["production_m3"], 3)
+    country_data["consumption_3m_avg"] = rolling_mean(
+        country_data["billed_volume_m3"], 3
+    )
+    country_data["consumption_12m_avg"] = rolling_mean(
+        country_data["billed_volume_m3"], 12
+    )
+
+    # -------- Simple NRW anomaly flags --------
+    # Domain sanity check: NRW should normally be between 0 and 100%
+    country_data["nrw_sanity_anomaly"] = (
+        country_data["nrw_pct"] < 0
+    ) | (country_data["nrw_pct"] > 100)
+
+    # OPTIONAL: simple statistical anomaly vs 12-month rolling median
+    country_data["nrw_roll_median"] = country_data["nrw_pct"].rolling(12).median()
+    country_data["nrw_abs_dev"] = (
+        country_data["nrw_pct"] - country_data["nrw_roll_median"]
+    ).abs()
+
+    dev_median = country_data["nrw_abs_dev"].median()
+    if pd.notna(dev_median) and dev_median > 0:
+        threshold = 3 * dev_median
+        country_data["nrw_stat_anomaly"] = country_data["nrw_abs_dev"] > threshold
+    else:
+        country_data["nrw_stat_anomaly"] = False
+
+    country_data["nrw_anomaly"] = (
+        country_data["nrw_sanity_anomaly"] | country_data["nrw_stat_anomaly"]
+    )
+
+    # YoY against the same calendar month a year earlier, for all three
+    # metrics at once. Looked up by (year, month) key rather than shift(12):
+    # months without production are dropped upstream, so row offsets need
+    # not line up with calendar months.
+    by_month = country_data.set_index(["year", "month"])[YOY_COLUMNS]
+    year, month = by_month.index[-1]
+    yoy = {col: None for col in YOY_COLUMNS}
+    if (year - 1, month) in by_month.index:
+        prev_vals = by_month.loc[(year - 1, month)]
+        change = (by_month.iloc[-1] - prev_vals) / prev_vals * 100.0
+        yoy.update(change[prev_vals != 0].to_dict())
+
+    return {
+        "country_data": country_data,
+        "zone_data": zone_data,
+        "mix_months": list(mix_months),
+        "mix_month_labels": mix_month_labels,
+        "nrw_yoy": yoy["nrw_pct"],
+        "prod_yoy": yoy["production_m3"],
+        "cons_yoy": yoy["billed_volume_m3"],
+    }
+
+
+@st.cache_data
+def get_zone_mix(country: str, month: pd.Timestamp) -> pd.DataFrame:
+    """
+    Zone rows for one month of the given country, with each zone's share of
+    that month's billed volume as volume_share.
+    """
+    zone_data = get_country_bundle(country)["zone_data"]
+    mix_df = zone_data[zone_data["month_start"] == month].copy()
+
+    total_vol = mix_df["billed_volume_m3"].sum()
+    if total_vol > 0:
+        mix_df["volume_share"] = mix_df["billed_volume_m3"] / total_vol
+    else:
+        mix_df["volume_share"] = 0.0
+
+    return mix_df
+
+
+@st.cache_resource
+def _fit_prophet(country: str):
+    """
+    Fit Prophet once on the full billed-consumption history for the given
+    country. Shared by the forecast and the in-sample fit, so neither a new
+    horizon nor the fit chart triggers another Stan fit. Returns None when the
+    country has no data.
+    """
+    df_country = get_country_bundle(country)["country_data"]
 
     if df_country.empty:
-        return pd.DataFrame(columns=["ds", "yhat", "yhat_lower", "yhat_upper"])
+        return None
 
     # Prepare data for Prophet
     df = df_country[["month_start", "billed_volume_m3"]].rename(
@@ -40,6 +535,19 @@ def get_consumption_forecast(country: str, periods: int) -> pd.DataFrame:
 
     model = Prophet()
     model.fit(df)
+    return model
+
+
+@st.cache_data
+def get_consumption_forecast(country: str, periods: int) -> pd.DataFrame:
+    """
+    Forecast billed consumption for the given country over the next
+    `periods` months, using the cached Prophet fit.
+    """
+    model = _fit_prophet(country)
+
+    if model is None:
+        return pd.DataFrame(columns=["ds", "yhat", "yhat_lower", "yhat_upper"])
 
     future = model.make_future_dataframe(periods=periods, freq="MS")
     forecast = model.predict(future)
@@ -50,22 +558,16 @@ def get_consumption_forecast(country: str, periods: int) -> pd.DataFrame:
 @st.cache_data
 def get_in_sample_fit(country: str) -> pd.DataFrame:
     """
-    Fit Prophet on the full history for the selected country and return
+    Predict each historical month with the cached Prophet fit and return
     ds, actual, predicted, error and abs_error for each historical month.
     """
-    df_country = prep.monthly_nrw_country()
-    df_country = df_country[df_country["country"] == country].copy()
-    df_country = df_country.sort_values("month_start")
+    model = _fit_prophet(country)
 
-    if df_country.empty:
+    if model is None:
         return pd.DataFrame(columns=["ds", "actual", "predicted", "error", "abs_error"])
 
-    df = df_country[["month_start", "billed_volume_m3"]].rename(
-        columns={"month_start": "ds", "billed_volume_m3": "y"}
-    )
-
-    model = Prophet()
-    model.fit(df)
+    # The model keeps its training frame as `history`
+    df = model.history[["ds", "y"]]
 
     forecast = model.predict(df[["ds"]])
 
@@ -85,55 +587,19 @@ def production_operations_page():
 
     # Load data
     df_country = get_monthly_nrw_country()
-    df_zone = get_monthly_billing_country_zone()
 
     # Sidebar country selector (local to this page)
-    countries = sorted(df_country["country"].unique())
+    # Categories are built from the data, so all present and already sorted
+    countries = list(df_country["country"].cat.categories)
     selected_country = st.sidebar.selectbox("Country", countries)
 
-    # Filter country-level data
-    country_data = df_country[df_country["country"] == selected_country].copy()
-    country_data = country_data.sort_values("month_start")
+    bundle = get_country_bundle(selected_country)
+    country_data = bundle["country_data"]
 
     if country_data.empty:
         st.warning(f"No country-level data available for {selected_country}.")
         return
 
-    # Compute rolling averages for trend KPIs
-    country_data["nrw_3m_avg"] = country_data["nrw_pct"].rolling(3).mean()
-    country_data["production_3m_avg"] = (
-        country_data["production_m3"].rolling(3).mean()
-    )
-    country_data["consumption_3m_avg"] = (
-        country_data["billed_volume_m3"].rolling(3).mean()
-    )
-    country_data["consumption_12m_avg"] = (
-        country_data["billed_volume_m3"].rolling(12).mean()
-    )
-
-    # -------- Simple NRW anomaly flags --------
-    # Domain sanity check: NRW should normally be between 0 and 100%
-    country_data["nrw_sanity_anomaly"] = (
-        country_data["nrw_pct"] < 0
-    ) | (country_data["nrw_pct"] > 100)
-
-    # OPTIONAL: simple statistical anomaly vs 12-month rolling median
-    country_data["nrw_roll_median"] = country_data["nrw_pct"].rolling(12).median()
-    country_data["nrw_abs_dev"] = (
-        country_data["nrw_pct"] - country_data["nrw_roll_median"]
-    ).abs()
-
-    dev_median = country_data["nrw_abs_dev"].median()
-    if pd.notna(dev_median) and dev_median > 0:
-        threshold = 3 * dev_median
-        country_data["nrw_stat_anomaly"] = country_data["nrw_abs_dev"] > threshold
-    else:
-        country_data["nrw_stat_anomaly"] = False
-
-    country_data["nrw_anomaly"] = (
-        country_data["nrw_sanity_anomaly"] | country_data["nrw_stat_anomaly"]
-    )
-
     # Latest / previous rows (now that all columns exist)
     latest = country_data.iloc[-1]
     prev = country_data.iloc[-2] if len(country_data) > 1 else None
@@ -145,22 +611,9 @@ def production_operations_page():
             "Please check the underlying production and billing data for this period."
         )
 
-    # Helper for YoY change
-    def compute_yoy_change(df: pd.DataFrame, col_name: str):
-        latest_row = df.iloc[-1]
-        year = latest_row["year"]
-        month = latest_row["month"]
-        prev_year_rows = df[(df["year"] == year - 1) & (df["month"] == month)]
-        if prev_year_rows.empty:
-            return None
-        prev_val = prev_year_rows[col_name].iloc[0]
-        if prev_val == 0:
-            return None
-        return (latest_row[col_name] - prev_val) / prev_val * 100.0
-
-    nrw_yoy = compute_yoy_change(country_data, "nrw_pct")
-    prod_yoy = compute_yoy_change(country_data, "production_m3")
-    cons_yoy = compute_yoy_change(country_data, "billed_volume_m3")
+    nrw_yoy = bundle["nrw_yoy"]
+    prod_yoy = bundle["prod_yoy"]
+    cons_yoy = bundle["cons_yoy"]
 
     # ---------- KPI CARDS ----------
 
@@ -225,9 +678,7 @@ def production_operations_page():
 
     st.markdown("---")
 
-    # Filter zone-level data for this country
-    zone_data = df_zone[df_zone["country"] == selected_country].copy()
-    zone_data = zone_data.sort_values("month_start")
+    zone_data = bundle["zone_data"]
 
     # ---------- TABS ----------
 
@@ -257,36 +708,7 @@ def production_operations_page():
     with tab_nrw:
         st.subheader("Monthly NRW% (Country Level)")
 
-        base = alt.Chart(country_data).encode(
-            x=alt.X(
-                "month_start:T",
-                title="Month",
-                axis=alt.Axis(format="%b %Y", labelAngle=-45),
-            ),
-            y=alt.Y(
-                "nrw_pct:Q",
-                title="NRW (%)",
-                scale=alt.Scale(zero=False),  # no forced zero, less blank space
-            ),
-            tooltip=[
-                alt.Tooltip("month_start:T", title="Month"),
-                "nrw_pct:Q",
-                "production_m3:Q",
-                "billed_volume_m3:Q",
-            ],
-        )
-
-        line = base.mark_line()
-
-        pts = base.mark_circle(size=70).encode(
-            color=alt.condition(
-                alt.datum.nrw_anomaly,
-                alt.value("#FF4B4B"),  # anomaly: red
-                alt.value("#4BC0C0"),  # normal: teal-ish
-            ),
-        )
-
-        st.altair_chart((line + pts).interactive(), use_container_width=True)
+        st.vega_lite_chart(country_data, NRW_OVERVIEW_SPEC, use_container_width=True)
 
         st.caption(
             "Red points indicate months where NRW looks unusual (for example below 0% "
@@ -301,8 +723,7 @@ def production_operations_page():
     with tab_prodcons:
         st.subheader("Monthly Production vs Billed Consumption")
 
-        pc_df = country_data[["month_start", "production_m3", "billed_volume_m3"]].copy()
-        pc_df = pc_df.melt(
+        pc_df = country_data[["month_start", "production_m3", "billed_volume_m3"]].melt(
             id_vars="month_start",
             value_vars=["production_m3", "billed_volume_m3"],
             var_name="metric",
@@ -327,32 +748,12 @@ def production_operations_page():
         else:
             pc_filtered = pc_df[pc_df["metric_label"].isin(selected_metrics)]
 
-            chart_pc = (
-                alt.Chart(pc_filtered)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "month_start:T",
-                        title="Month",
-                        axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                    ),
-                    y=alt.Y("value:Q", title="Volume (m³)"),
-                    color=alt.Color("metric_label:N", title="Series"),
-                    tooltip=[
-                        alt.Tooltip("month_start:T", title="Month"),
-                        "metric_label:N",
-                        alt.Tooltip("value:Q", title="Volume (m³)", format=",.0f"),
-                    ],
-                )
-                .properties(height=350)
-            )
-
-            st.altair_chart(chart_pc, use_container_width=True)
+            st.vega_lite_chart(pc_filtered, PROD_CONS_SPEC, use_container_width=True)
 
             with st.expander("Show underlying production vs consumption data"):
                 show_df = country_data[
                     ["month_start", "production_m3", "billed_volume_m3"]
-                ].copy()
+                ]
                 st.dataframe(show_df, use_container_width=True)
 
     # -------- TAB 3: FORECAST: CONSUMPTION --------
@@ -369,48 +770,23 @@ def production_operations_page():
 
         forecast_df = get_consumption_forecast(selected_country, forecast_horizon)
 
-        # Historical actuals
-        hist = country_data[["month_start", "billed_volume_m3"]].rename(
-            columns={"month_start": "ds", "billed_volume_m3": "y"}
+        # Historical actuals (already just ds, y, type)
+        hist = (
+            country_data[["month_start", "billed_volume_m3"]]
+            .rename(columns={"month_start": "ds", "billed_volume_m3": "y"})
+            .assign(type="Actual")
         )
-        hist["type"] = "Actual"
 
-        last_hist_date = hist["ds"].max()
-
-        # Future forecasts only
-        future = forecast_df[forecast_df["ds"] > last_hist_date].copy()
-        future = future.rename(columns={"yhat": "y"})
-        future["type"] = "Forecast"
-
-        plot_df = pd.concat(
-            [
-                hist[["ds", "y", "type"]],
-                future[["ds", "y", "type"]],
-            ],
-            ignore_index=True,
+        # Future forecasts only; the bounds stay on for the raw data expander
+        future = (
+            forecast_df[forecast_df["ds"] > hist["ds"].max()]
+            .rename(columns={"yhat": "y"})
+            .assign(type="Forecast")
         )
 
-        chart_fc = (
-            alt.Chart(plot_df)
-            .mark_line(point=True)
-            .encode(
-                x=alt.X(
-                    "ds:T",
-                    title="Month",
-                    axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                ),
-                y=alt.Y("y:Q", title="Billed Volume (m³)"),
-                color=alt.Color("type:N", title="Series"),
-                tooltip=[
-                    alt.Tooltip("ds:T", title="Month"),
-                    "type:N",
-                    alt.Tooltip("y:Q", title="Volume (m³)", format=",.0f"),
-                ],
-            )
-            .properties(height=350)
-        )
+        plot_df = pd.concat([hist, future[["ds", "y", "type"]]], ignore_index=True)
 
-        st.altair_chart(chart_fc, use_container_width=True)
+        st.vega_lite_chart(plot_df, FORECAST_SPEC, use_container_width=True)
 
         # ---- Model fit vs actual over the full history ----
         st.markdown("### How well does the model follow past consumption?")
@@ -433,32 +809,7 @@ def production_operations_page():
             }
             fit_long["series_label"] = fit_long["series"].map(series_labels)
 
-            chart_fit = (
-                alt.Chart(fit_long)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "ds:T",
-                        title="Month",
-                        axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                    ),
-                    y=alt.Y(
-                        "value:Q",
-                        title="Billed Volume (m³)",
-                        scale=alt.Scale(zero=False),
-                    ),
-                    color=alt.Color("series_label:N", title="Series"),
-                    tooltip=[
-                        alt.Tooltip("ds:T", title="Month"),
-                        "series_label:N",
-                        alt.Tooltip("value:Q", title="Volume (m³)", format=",.0f"),
-                    ],
-                )
-                .properties(height=300)
-                .interactive()
-            )
-
-            st.altair_chart(chart_fit, use_container_width=True)
+            st.vega_lite_chart(fit_long, MODEL_FIT_SPEC, use_container_width=True)
 
             st.caption(
                 "Blue line = actual billed consumption. "
@@ -467,39 +818,23 @@ def production_operations_page():
 
             st.markdown("#### Difference between model and actual (per month)")
 
-            error_chart = (
-                alt.Chart(fit_df)
-                .mark_bar()
-                .encode(
-                    x=alt.X(
-                        "ds:T",
-                        title="Month",
-                        axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                    ),
-                    y=alt.Y(
-                        "abs_error:Q",
-                        title="Absolute difference (m³)",
-                        scale=alt.Scale(zero=False),
-                    ),
-                    tooltip=[
-                        alt.Tooltip("ds:T", title="Month"),
-                        alt.Tooltip(
-                            "abs_error:Q",
-                            title="Difference between model and actual (m³)",
-                            format=",.0f",
-                        ),
-                    ],
-                )
-                .properties(height=200)
-                .interactive()
-            )
-
-            st.altair_chart(error_chart, use_container_width=True)
+            st.vega_lite_chart(fit_df, MODEL_ERROR_SPEC, use_container_width=True)
 
         st.markdown("### Smoothed Consumption Trend (Actuals Only)")
-        trend_df = country_data[["month_start", "billed_volume_m3"]].copy()
-        trend_df["cons_3m"] = trend_df["billed_volume_m3"].rolling(3).mean()
-        trend_df["cons_12m"] = trend_df["billed_volume_m3"].rolling(12).mean()
+        # The bundle already holds both consumption averages
+        trend_df = country_data[
+            [
+                "month_start",
+                "billed_volume_m3",
+                "consumption_3m_avg",
+                "consumption_12m_avg",
+            ]
+        ].rename(
+            columns={
+                "consumption_3m_avg": "cons_3m",
+                "consumption_12m_avg": "cons_12m",
+            }
+        )
 
         trend_long = trend_df.melt(
             id_vars="month_start",
@@ -515,71 +850,21 @@ def production_operations_page():
         }
         trend_long["series_label"] = trend_long["series"].map(series_labels)
 
-        chart_trend = (
-            alt.Chart(trend_long.dropna())
-            .mark_line(point=True)
-            .encode(
-                x=alt.X(
-                    "month_start:T",
-                    title="Month",
-                    axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                ),
-                y=alt.Y("value:Q", title="Billed Volume (m³)"),
-                color=alt.Color("series_label:N", title="Series"),
-                tooltip=[
-                    alt.Tooltip("month_start:T", title="Month"),
-                    "series_label:N",
-                    alt.Tooltip("value:Q", title="Volume (m³)", format=",.0f"),
-                ],
-            )
-            .properties(height=300)
+        st.vega_lite_chart(
+            trend_long.dropna(), CONSUMPTION_TREND_SPEC, use_container_width=True
         )
 
-        st.altair_chart(chart_trend, use_container_width=True)
-
         st.markdown("### Seasonal Consumption Pattern (Average by Month)")
-        season_df = country_data.copy()
-        season_df["month_name"] = season_df["month_start"].dt.strftime("%b")
-
-        month_order = [
-            "Jan",
-            "Feb",
-            "Mar",
-            "Apr",
-            "May",
-            "Jun",
-            "Jul",
-            "Aug",
-            "Sep",
-            "Oct",
-            "Nov",
-            "Dec",
-        ]
-
-        chart_season = (
-            alt.Chart(season_df)
-            .mark_bar()
-            .encode(
-                x=alt.X("month_name:N", title="Month", sort=month_order),
-                y=alt.Y(
-                    "billed_volume_m3:Q",
-                    aggregate="mean",
-                    title="Avg Billed Volume (m³)",
-                ),
-                tooltip=[
-                    "month_name:N",
-                    alt.Tooltip(
-                        "billed_volume_m3:Q",
-                        aggregate="mean",
-                        title="Avg Volume (m³)",
-                        format=",.0f",
-                    ),
-                ],
-            )
-            .properties(height=300)
+        # The 12 monthly means are computed here, so the chart ships 12 rows
+        # rather than the full history for the browser to aggregate
+        season_df = (
+            country_data.groupby("month", as_index=False)["billed_volume_m3"].mean()
         )
+        season_df["month_name"] = pd.to_datetime(
+            season_df["month"], format="%m"
+        ).dt.strftime("%b")
 
-        st.altair_chart(chart_season, use_container_width=True)
+        st.vega_lite_chart(season_df, SEASONAL_SPEC, use_container_width=True)
 
         with st.expander("Show forecast raw data"):
             st.dataframe(future, use_container_width=True)
@@ -603,27 +888,7 @@ def production_operations_page():
             else:
                 zf = zone_data[zone_data["zone"].isin(selected_zones)]
 
-                chart_zone_vol = (
-                    alt.Chart(zf)
-                    .mark_line(point=True)
-                    .encode(
-                        x=alt.X(
-                            "month_start:T",
-                            title="Month",
-                            axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                        ),
-                        y=alt.Y("billed_volume_m3:Q", title="Billed Volume (m³)"),
-                        color=alt.Color("zone:N", title="Zone"),
-                        tooltip=[
-                            alt.Tooltip("month_start:T", title="Month"),
-                            "zone:N",
-                            "billed_volume_m3:Q",
-                        ],
-                    )
-                    .properties(height=350)
-                )
-
-                st.altair_chart(chart_zone_vol, use_container_width=True)
+                st.vega_lite_chart(zf, ZONE_VOLUME_SPEC, use_container_width=True)
 
                 with st.expander("Show underlying zone-level billed volume data"):
                     st.dataframe(zf, use_container_width=True)
@@ -636,11 +901,9 @@ def production_operations_page():
             st.info("No zone-level billing data available for this country.")
         else:
             zd = zone_data.copy()
-            zd["collection_rate"] = zd.apply(
-                lambda row: row["paid_amount"] / row["billed_amount"]
-                if row["billed_amount"] > 0
-                else None,
-                axis=1,
+            # NaN where nothing was billed
+            zd["collection_rate"] = (zd["paid_amount"] / zd["billed_amount"]).where(
+                zd["billed_amount"] > 0
             )
 
             zones = sorted(zd["zone"].unique())
@@ -657,44 +920,13 @@ def production_operations_page():
                 zd_sel = zd[zd["zone"].isin(selected_zones)]
 
                 st.markdown("**Collection Rate Over Time**")
-                chart_coll = (
-                    alt.Chart(zd_sel)
-                    .mark_line(point=True)
-                    .encode(
-                        x=alt.X(
-                            "month_start:T",
-                            title="Month",
-                            axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                        ),
-                        y=alt.Y(
-                            "collection_rate:Q",
-                            title="Collection Rate",
-                            axis=alt.Axis(format="%", tickCount=5),
-                        ),
-                        color=alt.Color("zone:N", title="Zone"),
-                        tooltip=[
-                            alt.Tooltip("month_start:T", title="Month"),
-                            "zone:N",
-                            alt.Tooltip(
-                                "collection_rate:Q",
-                                title="Collection Rate",
-                                format=".1%",
-                            ),
-                            "billed_amount:Q",
-                            "paid_amount:Q",
-                        ],
-                    )
-                    .properties(height=300)
-                )
-
-                st.altair_chart(chart_coll, use_container_width=True)
+                st.vega_lite_chart(zd_sel, ZONE_COLLECTION_SPEC, use_container_width=True)
 
                 st.markdown("### Latest Month Revenue & Collections by Zone")
                 latest_month = zd_sel["month_start"].max()
-                latest_zd = zd_sel[zd_sel["month_start"] == latest_month].copy()
-
-                latest_zd = latest_zd[
-                    ["zone", "billed_amount", "paid_amount", "collection_rate"]
+                latest_zd = zd_sel.loc[
+                    zd_sel["month_start"] == latest_month,
+                    ["zone", "billed_amount", "paid_amount", "collection_rate"],
                 ].sort_values("collection_rate", ascending=True)
 
                 st.dataframe(latest_zd, use_container_width=True)
@@ -706,11 +938,11 @@ def production_operations_page():
         if zone_data.empty:
             st.info("No zone-level billing data available for this country.")
         else:
-            months = sorted(zone_data["month_start"].unique())
+            months = bundle["mix_months"]
             if not months:
                 st.info("No monthly data available.")
             else:
-                month_labels = [pd.to_datetime(m).strftime("%b %Y") for m in months]
+                month_labels = bundle["mix_month_labels"]
                 default_idx = len(months) - 1
 
                 selected_label = st.selectbox(
@@ -720,36 +952,11 @@ def production_operations_page():
                 )
                 selected_month = months[month_labels.index(selected_label)]
 
-                mix_df = zone_data[zone_data["month_start"] == selected_month].copy()
-
-                total_vol = mix_df["billed_volume_m3"].sum()
-                if total_vol > 0:
-                    mix_df["volume_share"] = mix_df["billed_volume_m3"] / total_vol
-                else:
-                    mix_df["volume_share"] = 0.0
+                mix_df = get_zone_mix(selected_country, selected_month)
 
                 st.markdown(f"**Zone share of billed volume for {selected_label}**")
 
-                chart_mix = (
-                    alt.Chart(mix_df)
-                    .mark_bar()
-                    .encode(
-                        x=alt.X("zone:N", title="Zone"),
-                        y=alt.Y(
-                            "volume_share:Q",
-                            title="Share of Billed Volume",
-                            axis=alt.Axis(format="%", tickCount=5),
-                        ),
-                        tooltip=[
-                            "zone:N",
-                            "billed_volume_m3:Q",
-                            alt.Tooltip("volume_share:Q", title="Share", format=".1%"),
-                        ],
-                    )
-                    .properties(height=350)
-                )
-
-                st.altair_chart(chart_mix, use_container_width=True)
+                st.vega_lite_chart(mix_df, ZONE_MIX_SPEC, use_container_width=True)
 
                 with st.expander("Show underlying mix data"):
                     st.dataframe(
@@ -781,58 +988,14 @@ def production_operations_page():
                         f"{avg_12m:.1f} h/day",
                     )
 
-            chart_hours = (
-                alt.Chart(country_data)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "month_start:T",
-                        title="Month",
-                        axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                    ),
-                    y=alt.Y(
-                        "avg_service_hours:Q",
-                        title="Average service hours per day",
-                    ),
-                    tooltip=[
-                        alt.Tooltip("month_start:T", title="Month"),
-                        alt.Tooltip(
-                            "avg_service_hours:Q", title="Hours/day", format=".1f"
-                        ),
-                    ],
-                )
-                .properties(height=350)
-            )
-
-            st.altair_chart(chart_hours, use_container_width=True)
+            st.vega_lite_chart(country_data, SERVICE_HOURS_SPEC, use_container_width=True)
 
             st.markdown("### Relationship between Service Hours and Consumption")
 
-            scatter = (
-                alt.Chart(country_data)
-                .mark_circle(size=80)
-                .encode(
-                    x=alt.X(
-                        "avg_service_hours:Q",
-                        title="Average service hours per day",
-                    ),
-                    y=alt.Y(
-                        "billed_volume_m3:Q",
-                        title="Billed volume (m³)",
-                    ),
-                    color=alt.Color("year:O", title="Year"),
-                    tooltip=[
-                        alt.Tooltip("month_start:T", title="Month"),
-                        "avg_service_hours:Q",
-                        "billed_volume_m3:Q",
-                        "year:O",
-                    ],
-                )
-                .properties(height=350)
+            st.vega_lite_chart(
+                country_data, HOURS_VS_CONSUMPTION_SPEC, use_container_width=True
             )
 
-            st.altair_chart(scatter, use_container_width=True)
-
             with st.expander("Show underlying continuity data"):
                 st.dataframe(
                     country_data[
@@ -905,60 +1068,11 @@ def production_operations_page():
 
             st.markdown("### Monthly Estimated Revenue at Risk from NRW")
 
-            chart_nrw_rev = (
-                alt.Chart(df_fin)
-                .mark_bar()
-                .encode(
-                    x=alt.X(
-                        "month_start:T",
-                        title="Month",
-                        axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                    ),
-                    y=alt.Y(
-                        "nrw_revenue_equiv:Q",
-                        title="Estimated NRW-related revenue (currency units)",
-                    ),
-                    tooltip=[
-                        alt.Tooltip("month_start:T", title="Month"),
-                        alt.Tooltip(
-                            "nrw_revenue_equiv:Q",
-                            title="NRW revenue equivalent",
-                            format=",.0f",
-                        ),
-                        alt.Tooltip(
-                            "nrw_volume_m3:Q", title="NRW volume (m³)", format=",.0f"
-                        ),
-                        alt.Tooltip(
-                            "implied_tariff:Q", title="Implied tariff", format=",.2f"
-                        ),
-                    ],
-                )
-                .properties(height=350)
-            )
-
-            st.altair_chart(chart_nrw_rev, use_container_width=True)
+            st.vega_lite_chart(df_fin, NRW_REVENUE_SPEC, use_container_width=True)
 
             st.markdown("### NRW% vs Revenue Impact")
 
-            chart_nrw_pct = (
-                alt.Chart(df_fin)
-                .mark_line(point=True)
-                .encode(
-                    x=alt.X(
-                        "month_start:T",
-                        title="Month",
-                        axis=alt.Axis(format="%b %Y", labelAngle=-45),
-                    ),
-                    y=alt.Y("nrw_pct:Q", title="NRW (%)"),
-                    tooltip=[
-                        alt.Tooltip("month_start:T", title="Month"),
-                        "nrw_pct:Q",
-                    ],
-                )
-                .properties(height=250)
-            )
-
-            st.altair_chart(chart_nrw_pct, use_container_width=True)
+            st.vega_lite_chart(df_fin, NRW_PCT_SPEC, use_container_width=True)
 
             with st.expander("Show underlying NRW financial data"):
                 st.dataframe(
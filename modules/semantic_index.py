@@ -3,8 +3,9 @@
 import os
 import json
 import hashlib
+import numpy as np
 import pandas as pd
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 
 import chromadb
 from chromadb.utils import embedding_functions
@@ -12,6 +13,15 @@ from chromadb.utils import embedding_functions
 EMBED_MODEL_NAME = "all-MiniLM-L6-v2"  
 COLLECTION_NAME = "water_semantic_index"
 META_DOC_ID = "__meta__"
+# Bump when the stored documents/metadata change shape, to force a rebuild
+INDEX_FORMAT_VERSION = 2
+
+
+def render_snippet(kind: str, dataset: str, column: str, text: str) -> str:
+    """
+    Planner-context form of an indexed doc.
+    """
+    return f"[{kind}] dataset={dataset}, column={column}\n{text}"
 
 
 class SemanticIndex:
@@ -56,7 +66,7 @@ class SemanticIndex:
 
         If a CSV changes or the config changes, this signature will change.
         """
-        payload = []
+        payload = [{"index_format": INDEX_FORMAT_VERSION}]
 
         for dataset_name, cfg in sorted(datasets_config.items()):
             path = cfg.get("path", "")
@@ -183,7 +193,11 @@ DESCRIPTION: {cfg.get("description", "")}
 COLUMNS: {', '.join(df.columns)}
 """.strip()
             docs.append(dataset_doc)
-            metadatas.append({"kind": "dataset", "dataset": dataset_name})
+            metadatas.append({
+                "kind": "dataset",
+                "dataset": dataset_name,
+                "rendered": render_snippet("dataset", dataset_name, "", dataset_doc),
+            })
             ids.append(f"dataset::{dataset_name}")
 
             # Column-level docs
@@ -209,6 +223,7 @@ EXAMPLE_VALUES: {values_str}
                     "kind": "column",
                     "dataset": dataset_name,
                     "column": col,
+                    "rendered": render_snippet("column", dataset_name, col, text),
                 })
                 ids.append(f"column::{dataset_name}::{col}")
 
@@ -219,23 +234,45 @@ EXAMPLE_VALUES: {values_str}
             print("[SemanticIndex] No docs to index.")
 
 
-    def retrieve(self, question: str, top_k: int = 8) -> List[Dict[str, Any]]:
+    def embed(self, text: str) -> np.ndarray:
+        """
+        Unit-length embedding of a piece of text, using the index's model.
+        """
+        vec = np.asarray(self.embedding_fn([text])[0], dtype=np.float32)
+        norm = np.linalg.norm(vec)
+        return vec / norm if norm else vec
+
+    def retrieve(
+        self, question: str, top_k: int = 8, embedding: Optional[np.ndarray] = None
+    ) -> List[Dict[str, Any]]:
         """
         Return top-k relevant docs (datasets + columns) for a question.
+        Pass a precomputed embedding of the question to skip re-embedding it.
+        Each item carries its pre-rendered planner snippet under 'rendered'.
         """
-        results = self.collection.query(
-            query_texts=[question],
-            n_results=top_k,
-        )
+        if embedding is not None:
+            results = self.collection.query(
+                query_embeddings=[embedding.tolist()],
+                n_results=top_k,
+            )
+        else:
+            results = self.collection.query(
+                query_texts=[question],
+                n_results=top_k,
+            )
 
         items: List[Dict[str, Any]] = []
         if not results["ids"] or len(results["ids"][0]) == 0:
             return items
 
         for doc, meta in zip(results["documents"][0], results["metadatas"][0]):
+            rendered = meta.get("rendered") or render_snippet(
+                meta.get("kind", ""), meta.get("dataset", ""), meta.get("column", ""), doc
+            )
             items.append({
                 "text": doc,
                 "metadata": meta,
+                "rendered": rendered,
             })
         return items
 